@@ -0,0 +1,182 @@
+"""
+Micro-benchmarks for the per-frame hot paths of Super Mario Motion.
+
+Measures average latency and memory allocated per call with the recorded
+landmark samples under tests/npy and with synthetic camera frames, so
+optimizations can be compared on each machine. Run with `make benchmark`.
+"""
+
+import glob
+import os
+import time
+import tracemalloc
+
+import cv2 as cv
+import numpy as np
+
+from super_mario_motion import gui, vision
+from super_mario_motion import path_helper as ph
+from super_mario_motion.pose_features import (
+    FeatureExtractor,
+    extract_features
+    )
+from super_mario_motion.settings import Settings
+
+npy_path = ph.resource_path(
+    os.path.join("..", "..", "tests", "npy")
+    )
+
+# cameras deliver 16:9 frames from this width on
+HD_WIDTH = 1280
+
+
+def load_landmarks(npy_dir=npy_path):
+    files = glob.glob(os.path.join(npy_dir, "**", "*.npy"), recursive=True)
+    if not files:
+        raise ValueError(f"[Benchmark] no npy files found in: {npy_dir}")
+    return [np.load(file).astype(np.float32) for file in files]
+
+
+def time_per_call(func, inputs, runs):
+    """Return the average execution time of `func` in microseconds."""
+    t_start = time.perf_counter()
+    for i in range(runs):
+        func(inputs[i % len(inputs)])
+    t_stop = time.perf_counter()
+    return (t_stop - t_start) / runs * 1e6
+
+
+def _peak_bytes(func, inputs, runs):
+    allocated = 0
+    for i in range(runs):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func(inputs[i % len(inputs)])
+        allocated += tracemalloc.get_traced_memory()[1] - current
+    return allocated / runs
+
+
+def bytes_per_call(func, inputs, runs):
+    """Return the average peak memory allocated during one call of `func`.
+
+    Uses tracemalloc, which also sees the buffers NumPy allocates for
+    temporary arrays. The overhead of an empty call is subtracted.
+    """
+    func(inputs[0])  # warm up caches and lazily created buffers
+    tracemalloc.start()
+    try:
+        baseline = _peak_bytes(lambda _: None, inputs, runs)
+        return max(0.0, _peak_bytes(func, inputs, runs) - baseline)
+    finally:
+        tracemalloc.stop()
+
+
+def bench_feature_extraction(landmarks, runs=5000):
+    """Compare `extract_features` with the preallocated FeatureExtractor."""
+    extractor = FeatureExtractor()
+    candidates = {
+        "extract_features": extract_features,
+        "FeatureExtractor.extract": extractor.extract,
+        }
+    return {
+        name: (
+            time_per_call(func, landmarks, runs),
+            bytes_per_call(func, landmarks, runs // 10),
+            )
+        for name, func in candidates.items()
+        }
+
+
+def previous_capture_path(bgr, width, canvas):
+    """The capture path before frames had a single RGB format.
+
+    Kept for comparison: the frame was always resized to `width` for both
+    inference and preview, converted into a new buffer, and letterboxed
+    through a temporary resized copy that was mirrored with a strided view.
+    """
+    h, w = bgr.shape[:2]
+    image = cv.resize(bgr, (width, int(h * width / float(w))))
+    rgb = cv.cvtColor(image, cv.COLOR_BGR2RGB)
+    new_w, new_h, x0, y0 = gui.letterbox_layout(
+        width, image.shape[0], *canvas.shape[1::-1]
+        )
+    resized = cv.resize(rgb, (new_w, new_h), interpolation=cv.INTER_AREA)
+    canvas[y0:y0 + new_h, x0:x0 + new_w] = resized[:, ::-1]
+    return canvas
+
+
+def current_capture_path(bgr, width, canvas):
+    """Camera frame to inference frame and preview canvas as done by
+    vision and gui, with an inference width of `width`."""
+    rgb = vision.to_canonical(bgr)
+    vision.inference_frame(rgb, width)
+    layout = gui.letterbox_layout(
+        rgb.shape[1], rgb.shape[0], *canvas.shape[1::-1]
+        )
+    return gui.render_letterbox(rgb, layout, canvas)
+
+
+def bench_capture_path(camera_width, runs=200):
+    """Compare the capture path for frames `camera_width` pixels wide.
+
+    Frames are 16:9 from HD_WIDTH on and 4:3 below, scaled to the default
+    `Settings.inference_res` for inference and letterboxed into the GUI
+    preview size.
+    """
+    if camera_width >= HD_WIDTH:
+        camera_height = camera_width * 9 // 16
+    else:
+        camera_height = camera_width * 3 // 4
+    rng = np.random.default_rng(0)
+    frames = [
+        rng.integers(
+            0, 256, (camera_height, camera_width, 3), dtype=np.uint8
+            )
+        for _ in range(4)
+        ]
+    canvas = np.zeros(
+        (gui.webcam_image_height, gui.webcam_image_width, 3), dtype=np.uint8
+        )
+    width = Settings.inference_res
+    candidates = {
+        "previous": previous_capture_path,
+        "current": current_capture_path,
+        }
+    results = {}
+    for name, path in candidates.items():
+        def func(frame, path_=path):
+            return path_(frame, width, canvas)
+
+        results[name] = (
+            time_per_call(func, frames, runs),
+            bytes_per_call(func, frames, runs // 10),
+            )
+    return results
+
+
+def print_results(title, results):
+    print(title)
+    for name, (micros, allocated) in results.items():
+        print(f"  {name:<32} {micros:8.2f} µs {allocated:10.0f} B/call")
+
+
+def main():
+    separator_length = 60
+    landmarks = load_landmarks()
+
+    print("#" * separator_length)
+    print_results(
+        "Feature extraction (single frame)",
+        bench_feature_extraction(landmarks)
+        )
+    for camera_width in (640, HD_WIDTH):
+        print("#" * separator_length)
+        print_results(
+            f"Capture path ({camera_width}px camera frame to preview)",
+            bench_capture_path(camera_width)
+            )
+    print("#" * separator_length)
+
+
+if __name__ == "__main__":
+    main()
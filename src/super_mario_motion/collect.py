@@ -1,13 +1,14 @@
 """
-Collects pose-sample data via MediaPipe Pose and writes feature rows to a
-CSV file.
-Provides a CLI for selecting label, duration, FPS, frame source (vision or
-camera),
-and output file. Used to record training data for pose-based models.
+Collects pose-sample data via MediaPipe Pose and appends feature rows to a
+binary sample store.
+Provides a long-lived `Collector` for recording several poses in one run
+and a CLI for selecting label, duration, FPS, frame source (landmarks,
+vision or camera),
+and output store. Used to record training data for pose-based models.
 """
 
 import argparse
-import csv
+import threading
 import time
 from pathlib import Path
 
@@ -16,12 +17,212 @@ import mediapipe as mp
 import numpy as np
 
 from super_mario_motion.pose_features import extract_features
+from super_mario_motion.sample_store import SampleStore
 from super_mario_motion.settings import Settings
 from super_mario_motion.state import StateManager
 
 # Init StateManager
 state_manager = StateManager()
 
+# how long to wait for a new landmark snapshot before checking the end time
+SNAPSHOT_TIMEOUT = 0.1
+
+SOURCES = ["auto", "landmarks", "vision", "camera"]
+
+
+def _wall_time(perf_timestamp: float) -> float:
+    """Convert a time.perf_counter() timestamp to time.time()."""
+    return time.time() - (time.perf_counter() - perf_timestamp)
+
+
+def record_landmarks(
+    store, label: str, seconds: float, fps: float, stop_event=None
+    ) -> int:
+    """Append the landmarks the running app publishes to `store`.
+
+    Consumes the snapshots `vision.cam_loop` publishes through the
+    StateManager instead of running a second MediaPipe Pose, so recording
+    adds no inference cost. Every camera frame is saved at most once.
+
+    Args:
+        store: SampleStore the samples are appended to.
+        label: Class label for all collected samples.
+        seconds: Duration of the recording in seconds.
+        fps: Target sampling rate.
+        stop_event: Optional threading.Event that ends the recording early.
+
+    Returns:
+        int: Number of saved samples.
+    """
+    t_end = time.time() + seconds
+    period = 1.0 / max(1e-3, fps)
+    snapshot = state_manager.get_snapshot()
+    last_version, last_frame_id = snapshot.version, snapshot.frame_id
+    n_saved = 0
+
+    next_t = time.time()
+    while time.time() < t_end:
+        if stop_event is not None and stop_event.is_set():
+            break
+        snapshot = state_manager.wait_for_snapshot(
+            last_version, timeout=SNAPSHOT_TIMEOUT
+            )
+        if snapshot is None:
+            continue
+        last_version = snapshot.version
+        if snapshot.landmarks is None or snapshot.frame_id == last_frame_id:
+            continue
+        last_frame_id = snapshot.frame_id
+
+        lm_arr = snapshot.landmarks
+        store.append(
+            label, extract_features(lm_arr), lm_arr,
+            _wall_time(snapshot.timestamp)
+            )
+        n_saved += 1
+
+        next_t += period
+        sleep_for = min(next_t, t_end) - time.time()
+        if sleep_for > 0:
+            time.sleep(sleep_for)
+    return n_saved
+
+
+class Collector:
+    """Records pose samples of several labels into one sample store.
+
+    Opens the store (and, for frame sources, the MediaPipe Pose graph and
+    camera) once per collection run. Samples are buffered in memory and
+    flushed as one shard at the end of every `record` step.
+
+    Args:
+        store_path: Sample store directory.
+        run_name: Prefix for the shards written in this run.
+        source: "landmarks", "vision", "camera" or "auto", see `main`.
+        fps: Target sampling rate.
+        camera_index: OpenCV camera index for camera / auto-fallback.
+    """
+
+    def __init__(
+        self, store_path, run_name: str = "run", source: str = "landmarks",
+        fps: float = Settings.collection_fps, camera_index: int = 0
+        ):
+        if source not in SOURCES:
+            raise ValueError(f"[collect] unknown source: {source}")
+        self.store = SampleStore(store_path, run_name=run_name)
+        self.source = source
+        self.fps = fps
+        self.camera_index = camera_index
+        self._pose = None
+        self._cam = None
+        self._stop = threading.Event()
+
+        if source == "camera":
+            self._cam = cv.VideoCapture(camera_index)
+            if not self._cam.isOpened():
+                raise IOError(
+                    f"[collect] Could not open camera {camera_index}."
+                    )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, label: str, seconds: float) -> int:
+        """Record samples for `label` and flush them as one shard.
+
+        Returns:
+            int: Number of saved samples.
+        """
+        self._stop.clear()
+        if self.source == "landmarks":
+            n_saved = record_landmarks(
+                self.store, label, seconds, self.fps, self._stop
+                )
+        else:
+            n_saved = self._record_frames(label, seconds)
+        self.store.flush()
+        return n_saved
+
+    def stop(self):
+        """Make a running `record` call return early; thread-safe."""
+        self._stop.set()
+
+    def close(self):
+        """Flush remaining samples and release MediaPipe and the camera."""
+        self.store.close()
+        if self._pose is not None:
+            self._pose.close()
+            self._pose = None
+        if self._cam is not None:
+            self._cam.release()
+            self._cam = None
+
+    def _read_frame(self):
+        # frames from vision are already RGB, see vision.to_canonical
+        rgb = None
+        if self.source in ("auto", "vision"):
+            rgb = state_manager.get_opencv_image_webcam()
+
+        if rgb is None and self.source in ("auto", "camera"):
+            if self._cam is None:
+                self._cam = cv.VideoCapture(self.camera_index)
+            if not self._cam.isOpened():
+                print(
+                    f"[collect] WARN: camera {self.camera_index} not "
+                    f"available."
+                    )
+                self._cam.release()
+                self._cam = None
+                time.sleep(0.05)
+                return None
+            ok, bgr = self._cam.read()
+            if not ok:
+                return None
+            rgb = cv.cvtColor(bgr, cv.COLOR_BGR2RGB, dst=bgr)
+        return rgb
+
+    def _record_frames(self, label: str, seconds: float) -> int:
+        if self._pose is None:
+            self._pose = mp.solutions.pose.Pose()
+
+        t_end = time.time() + seconds
+        period = 1.0 / max(1e-3, self.fps)
+        n_saved = 0
+
+        next_t = 0.0
+        start_time = time.time()
+
+        while time.time() < t_end and not self._stop.is_set():
+            rgb = self._read_frame()
+            if rgb is None:
+                time.sleep(0.01)
+                continue
+
+            res = self._pose.process(rgb)
+            if not res.pose_landmarks:
+                time.sleep(0.002)
+                continue
+
+            lm = res.pose_landmarks.landmark
+            lm_arr = np.array(
+                [[p.x, p.y, p.z, p.visibility] for p in lm],
+                dtype=np.float32
+                )
+
+            feat = extract_features(lm_arr)
+
+            self.store.append(label, feat, lm_arr, time.time())
+            n_saved += 1
+
+            next_t += period
+            sleep_for = next_t - (time.time() - start_time)
+            if sleep_for > 0:
+                time.sleep(sleep_for)
+        return n_saved
+
 
 def main():
     """Run pose sample collection as a CLI program.
@@ -32,24 +233,27 @@ def main():
             (e.g., standing, walking_right, ...).
         --seconds (float, default=30):
             Duration of the recording in seconds.
-        --csv (str, default="pose_samples.csv"):
-            Name of the CSV file (stored under ./data/).
+        --store (str, default="samples"):
+            Sample store directory (relative paths are stored under
+            ./data/).
+        --run-name (str, default="run"):
+            Prefix for the shard written by this recording.
         --fps (float, default=20.0):
             Target sampling rate for saving feature rows.
-        --source ({"auto", "vision", "camera"}, default="auto"):
+        --source ({"auto", "landmarks", "vision", "camera"},
+                  default="auto"):
             Source of frames:
+              - "landmarks": use the landmarks the running app already
+                detected, without running MediaPipe again
               - "vision": use frames from StateManager / running app
               - "camera": read directly from an OpenCV camera
               - "auto": try vision first, fall back to camera.
         --camera-index (int, default=0):
             OpenCV camera index for camera / auto-fallback.
 
-    The function captures frames, runs MediaPipe Pose, extracts features
-    via `extract_features` and appends lines of the form:
-
-        label, feat_0, feat_1, ..., feat_N
-
-    to the configured CSV file.
+    Records one label with a `Collector`, which extracts features via
+    `extract_features` and appends them with the label, the raw landmarks
+    and their timestamp to the configured SampleStore.
     """
     ap = argparse.ArgumentParser()
     ap.add_argument(
@@ -60,16 +264,18 @@ def main():
         "--seconds", type=float, default=30,
         help="duration of recording"
         )
-    ap.add_argument("--csv", default="pose_samples.csv")
+    ap.add_argument("--store", default="samples")
+    ap.add_argument("--run-name", default="run")
     ap.add_argument(
         "--fps", type=float, default=Settings.collection_fps,
         help="goal-sampling rate"
         )
 
     ap.add_argument(
-        "--source", choices=["auto", "vision", "camera"],
+        "--source", choices=SOURCES,
         default="auto",
-        help="Frame-Source: 'auto' try vision first, else camera."
+        help="Frame-Source: 'landmarks' reuse the app's landmarks, "
+             "'auto' try vision first, else camera."
         )
     ap.add_argument(
         "--camera-index", type=int, default=0,
@@ -79,9 +285,7 @@ def main():
 
     args = ap.parse_args()
 
-    mp_pose = mp.solutions.pose
-    out_path = Path(__file__).parent.parent.parent / "data" / args.csv
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path = Path(__file__).parent.parent.parent / "data" / args.store
 
     print(
         f"[collect] start recording: label={args.label}, {args.seconds}s, "
@@ -89,76 +293,11 @@ def main():
         f"{out_path}"
         )
 
-    t_end = time.time() + args.seconds
-    period = 1.0 / max(1e-3, args.fps)
-    n_saved = 0
-
-    cam = None
-    if args.source == "camera":
-        cam = cv.VideoCapture(args.camera_index)
-        if not cam.isOpened():
-            raise IOError(
-                f"[collect] Could not open camera {args.camera_index}."
-                )
-
-    with mp_pose.Pose() as pose, open(out_path, "a", newline="") as f:
-
-        writer = csv.writer(f)
-
-        next_t = 0.0
-        start_time = time.time()
-
-        while time.time() < t_end:
-            bgr = None
-
-            if args.source in ("auto", "vision"):
-                bgr = state_manager.get_opencv_image_webcam()
-
-            if bgr is None and args.source in ("auto", "camera"):
-                if cam is None:
-                    cam = cv.VideoCapture(args.camera_index)
-                    if not cam.isOpened():
-                        print(
-                            f"[collect] WARN: camera {args.camera_index} not "
-                            f"available."
-                            )
-                        time.sleep(0.05)
-                        continue
-                ok, bgr = cam.read()
-                if not ok:
-                    time.sleep(0.01)
-                    continue
-
-            if bgr is None:
-                time.sleep(0.01)
-                continue
-
-            rgb = cv.cvtColor(bgr, cv.COLOR_BGR2RGB)
-            res = pose.process(rgb)
-            if not res.pose_landmarks:
-                time.sleep(0.002)
-                continue
-
-            lm = res.pose_landmarks.landmark
-            lm_arr = np.array(
-                [[p.x, p.y, p.z, p.visibility] for p in lm],
-                dtype=np.float32
-                )
-
-            feat = extract_features(lm_arr)
-
-            writer.writerow(
-                [args.label] + [f"{x:.6f}" for x in feat.tolist()]
-                )
-            n_saved += 1
-
-            next_t += period
-            sleep_for = next_t - (time.time() - start_time)
-            if sleep_for > 0:
-                time.sleep(sleep_for)
-
-    if cam is not None:
-        cam.release()
+    with Collector(
+            out_path, run_name=args.run_name, source=args.source,
+            fps=args.fps, camera_index=args.camera_index
+            ) as collector:
+        n_saved = collector.record(args.label, args.seconds)
 
     print(f"[collect] Done. Saved: {n_saved} Samples.")
 
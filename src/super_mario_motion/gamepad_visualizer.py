@@ -2,7 +2,9 @@
 Utilities for mapping pose labels to virtual gamepad inputs and rendering
 a gamepad image with highlighted buttons. Provides functions to load the
 base controller image, translate poses into button presses, and draw
-visual overlays indicating active inputs.
+visual overlays indicating active inputs. Composited frames are cached per
+pressed-button set and size, since there are only a handful of distinct
+button combinations.
 """
 import os
 from typing import Iterable, List
@@ -29,6 +31,9 @@ BUTTON_POSITIONS = {
 base_image: Image.Image | None = None
 last_orientation: str = "right"
 
+# (pressed buttons, size) -> composited RGB frame of the default base image
+frame_cache: dict[tuple[frozenset, tuple[int, int] | None], Image.Image] = {}
+
 
 def get_base_image() -> Image.Image:
     """Load and cache the base gamepad image.
@@ -121,6 +126,59 @@ def draw_highlight_overlay(
     return overlay
 
 
+def pressed_buttons(pose: str, send_active: bool = True) -> frozenset:
+    """Return the set of highlighted buttons for a pose.
+
+    Args:
+        pose: Pose label that will be mapped to button presses.
+        send_active: If False, no buttons are pressed.
+
+    Returns:
+        frozenset[str]: Pressed button names, usable as a cache key.
+    """
+    if not send_active:
+        return frozenset()
+    return frozenset(pose_to_buttons(pose))
+
+
+def compose_gamepad_image(
+    base: Image.Image, pressed: Iterable[str]
+    ) -> Image.Image:
+    """Draw the highlights of `pressed` onto `base` and return it as RGB."""
+    img = base
+    if pressed:
+        overlay = draw_highlight_overlay(img.size, pressed)
+        img = Image.alpha_composite(img, overlay)
+    return img.convert("RGB")
+
+
+def get_gamepad_frame(
+    pressed: frozenset, size: tuple[int, int] | None = None
+    ) -> Image.Image:
+    """Return the cached gamepad frame for a pressed-button set.
+
+    Frames are composited from the default base image and resized to
+    `size` once, on first use. The returned image is shared and must not
+    be modified.
+
+    Args:
+        pressed: Pressed buttons, e.g. from `pressed_buttons`.
+        size: Optional (width, height) to resize the frame to.
+
+    Returns:
+        Image.Image: RGB gamepad frame.
+    """
+    key = (pressed, size)
+    frame = frame_cache.get(key)
+    if frame is None:
+        # sort so equal sets always draw their overlays in the same order
+        frame = compose_gamepad_image(get_base_image(), sorted(pressed))
+        if size is not None:
+            frame = frame.resize(size, Image.LANCZOS)
+        frame_cache[key] = frame
+    return frame
+
+
 def create_gamepad_image(
     pose: str, send_active: bool = True,
     base_image_: Image.Image | None = None
@@ -137,15 +195,9 @@ def create_gamepad_image(
     Returns:
         Image.Image: Final RGB image of the gamepad with highlights.
     """
-    base = (base_image_.convert(
-        "RGBA"
-        ) if base_image_ is not None else get_base_image())
-    img = base.copy()
-
-    if send_active:
-        pressed = pose_to_buttons(pose)
-        if pressed:
-            overlay = draw_highlight_overlay(img.size, pressed)
-            img = Image.alpha_composite(img, overlay)
-
-    return img.convert("RGB")
+    pressed = pressed_buttons(pose, send_active)
+    if base_image_ is None:
+        return get_gamepad_frame(pressed).copy()
+    return compose_gamepad_image(
+        base_image_.convert("RGBA"), sorted(pressed)
+        )
@@ -12,6 +12,7 @@ import random
 import subprocess
 import sys
 import threading
+import time
 import tkinter as tk
 import tkinter.font as tkfont
 import webbrowser
@@ -20,10 +21,11 @@ from pathlib import Path
 from tkinter import ttk
 
 import cv2
+import numpy as np
 from PIL import Image, ImageTk
 
 from super_mario_motion import (
-    game_launcher, path_helper as ph,
+    game_launcher, gamepad_visualizer, latency, path_helper as ph,
     vision as vision
     )
 from super_mario_motion.settings import Settings
@@ -43,6 +45,7 @@ allow_debug_info, send_keystrokes, checkbox_toggle_inputs = None, None, None
     label_current_pose,
     label_debug_landmarks
     ) = None, None, None, None
+label_debug_latency = None
 button_collect_start, label_collect_status = None, None
 startup_overlay = None
 startup_overlay_label = None
@@ -65,10 +68,27 @@ gui_cams_available = []  # filtered list shown in GUI
 webcam_image_width = 612
 webcam_image_height = 408
 collect_scale = 1.1
+# Cached letterbox layouts, the canvas the preview is drawn into with its
+# current layout, the persistent PhotoImage showing it and the
+# (frame id, preview mode, scale) last drawn
+preview_layouts = {}
+preview_canvas = None
+preview_layout = None
+preview_photo = None
+preview_resized = None
+last_preview_key = None
+
+# Latency debug panel, refreshed at most every LATENCY_REFRESH_S seconds
+LATENCY_REFRESH_S = 0.5
+last_latency_refresh = 0.0
+LATENCY_FILE_NAME = "latency.json"
 
 # Gamepad
 gamepad_image_width = 200
 gamepad_image_height = 100
+# PhotoImage per pressed-button set and the set currently shown
+gamepad_photos = {}
+shown_gamepad_buttons = None
 
 # Colors
 color_background = "#202326"
@@ -85,6 +105,18 @@ path_image_pose_default = ph.resource_path(
     )
 path_image_gamepad = ph.resource_path(os.path.join("images", "gamepad.png"))
 
+# Pose icons, loaded once into PhotoImages; shown_pose_image is the key
+# currently displayed
+VALID_POSES = [
+    "standing", "jumping", "crouching", "throwing",
+    "walking_right", "walking_left", "running_right", "running_left",
+    "swimming"
+    ]
+UNKNOWN_POSE = "unknown"
+pose_image_size = (100, 100)
+pose_images = {}
+shown_pose_image = None
+
 # App Icons per platform
 path_icon_windows = ph.resource_path(os.path.join("images", "icon.ico"))
 path_icon_mac = ph.resource_path(os.path.join("images", "icon.icns"))
@@ -112,8 +144,10 @@ COLLECTION_STEPS = [
     ("throwing", 10),
     ("swimming", 10),
     ]
-CSV_PATH = "pose_samples.csv"
-current_run_csv = CSV_PATH
+SAMPLE_STORE_NAME = "samples"
+# collect.Collector of the current collection run and its record thread
+collector = None
+collect_thread = None
 
 # Will hold the randomized order for a single collection run
 collection_order = None
@@ -219,12 +253,8 @@ def init():
                 Image.LANCZOS
                 )
             )
-        image_pose = ImageTk.PhotoImage(
-            Image.open(path_image_pose_default).resize(
-                (100, 100),
-                Image.LANCZOS
-                )
-            )
+        pose_images.update(load_pose_images())
+        image_pose = pose_images[UNKNOWN_POSE]
         image_gamepad = ImageTk.PhotoImage(
             Image.open(path_image_gamepad).resize(
                 (gamepad_image_width, gamepad_image_height),
@@ -583,6 +613,15 @@ def init():
         )
     label_debug_landmarks.grid(row=2, column=0, columnspan=2)
 
+    # latency debug text
+    global label_debug_latency
+    label_debug_latency = tk.Label(
+        frame_bottom_right, bg=color_dark_widget,
+        fg=color_white, justify="left",
+        font=("Consolas", 6)
+        )
+    label_debug_latency.grid(row=3, column=0, columnspan=2)
+
     config_validation()
 
     # Text Label for the collection status, visible during collect mode
@@ -702,14 +741,76 @@ def set_available_cams(gui_list, raw_list, status_text: str | None = None):
 
 # set_webcam_image and set_pose_image are supposed to be called in the
 # update-loop in main.py
-def set_webcam_image(webcam, webcam_skeleton, only_skeleton):
+def letterbox_layout(src_w, src_h, dst_w, dst_h):
+    """Return the size and offset of a source image letterboxed into the
+    destination size, keeping the aspect ratio.
+
+    Results are cached, since the sizes only change with the camera
+    resolution or the preview scale.
+
+    Returns:
+        tuple[int, int, int, int]: new_w, new_h, x offset, y offset.
+    """
+    key = (src_w, src_h, dst_w, dst_h)
+    layout = preview_layouts.get(key)
+    if layout is None:
+        src_ratio = src_w / src_h
+        dst_ratio = dst_w / dst_h
+        if src_ratio > dst_ratio:
+            new_w = dst_w
+            new_h = int(dst_w / src_ratio)
+        else:
+            new_h = dst_h
+            new_w = int(dst_h * src_ratio)
+        layout = (new_w, new_h, (dst_w - new_w) // 2, (dst_h - new_h) // 2)
+        preview_layouts[key] = layout
+    return layout
+
+
+def render_letterbox(array, layout, canvas):
+    """Resize `array` into its letterbox region of `canvas`, mirrored.
+
+    The black bars of `canvas` are never touched, so the canvas can be
+    reused for every frame with the same layout. The resized image goes
+    to the reused `preview_resized` buffer and is flipped straight into
+    the canvas, so no memory is allocated per frame.
+
+    Bilinear interpolation is used: INTER_AREA is several times slower
+    for the non-integer ratios of the preview (e.g. 1280 to 612 pixels)
+    and looks no different at this size.
+    """
+    global preview_resized
+    new_w, new_h, x0, y0 = layout
+    resized = array
+    if array.shape[1::-1] != (new_w, new_h):
+        shape = (new_h, new_w) + array.shape[2:]
+        if preview_resized is None or preview_resized.shape != shape:
+            preview_resized = np.empty(shape, dtype=array.dtype)
+        resized = cv2.resize(
+            array, (new_w, new_h), dst=preview_resized,
+            interpolation=cv2.INTER_LINEAR
+            )
+    # flip the camera horizontally only for the user
+    cv2.flip(resized, 1, dst=canvas[y0:y0 + new_h, x0:x0 + new_w])
+    return canvas
+
+
+def set_webcam_image(webcam, webcam_skeleton, only_skeleton, frame_id=None):
     """Update the webcam preview image according to the selected preview mode.
 
     The input images are numpy arrays; this function mirrors the image for the
     user, letterboxes it to the fixed preview size, and updates the label.
+    Frames that were already shown in the same preview mode and scale are
+    skipped, and the pixels are pasted into one persistent PhotoImage.
+
+    Args:
+        webcam, webcam_skeleton, only_skeleton: RGB preview images.
+        frame_id: Camera frame id of the images, None to always redraw.
     """
-    global array
-    match selected_preview.get():
+    global array, preview_canvas, preview_photo, preview_layout
+    global last_preview_key
+    preview_mode = selected_preview.get()
+    match preview_mode:
         case "Webcam":
             array = webcam
         case "Webcam + Skeleton":
@@ -722,55 +823,63 @@ def set_webcam_image(webcam, webcam_skeleton, only_skeleton):
     if array is None:
         return
 
-    array = array[:, ::-1, :]  # flip the camera horizontally only for the user
-    # image = ImageTk.PhotoImage(Image.fromarray(array).resize((
-    # webcam_image_width, webcam_image_height), Image.LANCZOS))
-
-    # calculate the source and destination image ratios
-    img = Image.fromarray(array)
-    src_w, src_h = img.size
-    dst_w_base, dst_h_base = webcam_image_width, webcam_image_height
     if selected_mode is not None and selected_mode.get() == "Collect":
         scale = collect_scale
     else:
         scale = 1.0
 
-    dst_w = int(dst_w_base * scale)
-    dst_h = int(dst_h_base * scale)
+    preview_key = (frame_id, preview_mode, scale)
+    if frame_id is not None and preview_key == last_preview_key:
+        return
+    last_preview_key = preview_key
 
-    src_ratio = src_w / src_h
-    dst_ratio = dst_w / dst_h
+    dst_w = int(webcam_image_width * scale)
+    dst_h = int(webcam_image_height * scale)
+    src_h, src_w = array.shape[:2]
+    layout = letterbox_layout(src_w, src_h, dst_w, dst_h)
 
-    # keep the aspect ratio and resize the image
-    if src_ratio > dst_ratio:
-        new_w = dst_w
-        new_h = int(dst_w / src_ratio)
+    # add black bars to the resized image to maintain webcam preview size
+    if preview_canvas is None or preview_canvas.shape[:2] != (dst_h, dst_w):
+        preview_canvas = np.zeros((dst_h, dst_w, 3), dtype=np.uint8)
+        preview_photo = None
+    elif layout != preview_layout:
+        preview_canvas[:] = 0
+    preview_layout = layout
+    render_letterbox(array, layout, preview_canvas)
+
+    image = Image.fromarray(preview_canvas)
+    if preview_photo is None:
+        preview_photo = ImageTk.PhotoImage(image)
+        label_webcam.config(image=preview_photo)
+        label_webcam.image = preview_photo
     else:
-        new_h = dst_h
-        new_w = int(dst_h * src_ratio)
+        preview_photo.paste(image)
 
-    # add black bars to the resized image to maintain webcam preview size
-    img = img.resize((new_w, new_h), Image.LANCZOS)
-    canvas = Image.new("RGB", (dst_w, dst_h), (0, 0, 0))
-    canvas.paste(img, ((dst_w - new_w) // 2, (dst_h - new_h) // 2))
-    image = ImageTk.PhotoImage(canvas)
 
-    label_webcam.config(image=image)
-    label_webcam.image = image
+def set_gamepad_buttons(pressed):
+    """Show the virtual gamepad with the given buttons highlighted.
 
+    The PhotoImage of every button combination is created once from the
+    cached frames of gamepad_visualizer.py and reused; the label is only
+    reconfigured when the pressed buttons change.
 
-def set_gamepad_image(updated_gamepad_image):
-    """Update the virtual gamepad preview image using the logic of
-    gamepad_visualizer.py."""
-    if updated_gamepad_image is None:
+    Args:
+        pressed: frozenset of pressed button names.
+    """
+    global shown_gamepad_buttons
+    if pressed == shown_gamepad_buttons:
         return
-    image = ImageTk.PhotoImage(
-        updated_gamepad_image.resize(
-            (gamepad_image_width, gamepad_image_height), Image.LANCZOS
+    image = gamepad_photos.get(pressed)
+    if image is None:
+        image = ImageTk.PhotoImage(
+            gamepad_visualizer.get_gamepad_frame(
+                pressed, (gamepad_image_width, gamepad_image_height)
+                )
             )
-        )
+        gamepad_photos[pressed] = image
     label_virtual_gamepad_visualizer.config(image=image)
     label_virtual_gamepad_visualizer.image = image
+    shown_gamepad_buttons = pressed
 
 
 def update_pose(new_pose):
@@ -778,36 +887,43 @@ def update_pose(new_pose):
     pose = new_pose
 
 
-def update_pose_image():
-    """Update the pose image icon based on the current pose name."""
-    valid_poses = [
-        "standing", "jumping", "crouching", "throwing",
-        "walking_right", "walking_left", "running_right", "running_left",
-        "swimming"
-        ]
-    if pose in valid_poses:
+def load_pose_images():
+    """Load and resize every pose icon (and the unknown icon) once.
+
+    Returns:
+        dict[str, ImageTk.PhotoImage]: Icon per pose, "unknown" included.
+    """
+    paths = {
+        pose_: ph.resource_path(os.path.join("images", pose_ + ".png"))
+        for pose_ in VALID_POSES
+        }
+    paths[UNKNOWN_POSE] = path_image_pose_default
+    images = {}
+    for pose_, path in paths.items():
         try:
-            window.image_pose = ImageTk.PhotoImage(
-                Image.open(
-                    ph.resource_path(os.path.join("images", pose + ".png"))
-                    ).resize(
-                    (100, 100), Image.LANCZOS
+            with Image.open(path) as icon:
+                images[pose_] = ImageTk.PhotoImage(
+                    icon.resize(pose_image_size, Image.LANCZOS)
                     )
-                )
         except FileNotFoundError:
             print("Error: File not found")
             sys.exit(1)
-    else:
-        # Display question mark symbol if unknown pose is performed
-        window.image_pose = ImageTk.PhotoImage(
-            Image.open(path_image_pose_default).resize(
-                (100, 100),
-                Image.LANCZOS
-                )
-            )
+    return images
 
+
+def update_pose_image():
+    """Show the cached icon of the current pose if the pose changed."""
+    global shown_pose_image
+    key = pose if pose in VALID_POSES else UNKNOWN_POSE
+    if key == shown_pose_image:
+        return
+    if not pose_images:
+        pose_images.update(load_pose_images())
+    # Display question mark symbol if unknown pose is performed
+    window.image_pose = pose_images[key]
     label_pose_visualizer.config(image=window.image_pose)
     label_pose_visualizer.image = window.image_pose
+    shown_pose_image = key
 
 
 def update_pose_text():
@@ -820,6 +936,20 @@ def update_debug_landmarks(landmarks):
         )
 
 
+def update_debug_latency():
+    """Show the per-stage latency percentiles while debug info is on."""
+    global last_latency_refresh
+    if not allow_debug_info.get():
+        if label_debug_latency.cget("text"):
+            label_debug_latency.config(text="")
+        return
+    now = time.monotonic()
+    if now - last_latency_refresh < LATENCY_REFRESH_S:
+        return
+    last_latency_refresh = now
+    label_debug_latency.config(text=latency.format_summary())
+
+
 def apply_mode(mode: str):
     """Switch the UI between play modes and collect mode.
 
@@ -917,9 +1047,11 @@ def _cancel_scheduled():
 
 def start_collect_sequence():
     """Start a full pose collection run with randomized pose order."""
-    global collecting, collect_stop, current_run_csv, collection_order
+    global collecting, collect_stop, collector, collection_order
     if collecting:
         return
+    # Lazy-import to avoid heavy MediaPipe dependency during app startup.
+    from super_mario_motion import collect as _collect
     collect_stop = False
     collecting = True
     _cancel_scheduled()
@@ -929,9 +1061,13 @@ def start_collect_sequence():
     runs_dir = Path(state_manager.get_data_folder_path())
 
     user = getpass.getuser()
-    current_run_csv = str(
-        runs_dir / f"pose_samples_{user}_"
-                   f"{datetime.now().strftime("%d.%m.%Y_%H.%M")}.csv"
+    run_name = (
+        f"pose_samples_{user}_"
+        f"{datetime.now().strftime("%d.%m.%Y_%H.%M")}"
+    )
+    collector = _collect.Collector(
+        runs_dir / SAMPLE_STORE_NAME, run_name=run_name,
+        source="landmarks", fps=Settings.webcam_fps
         )
     label_collect_status.config(text="Starting Sequence…")
     _set_collect_button(starting=True)
@@ -943,6 +1079,14 @@ def stop_collect_sequence():
     collect_stop = True
     collecting = False
     _cancel_scheduled()
+    # the record thread may clear the global collector at any time
+    active = collector
+    if active is not None:
+        if collect_thread is not None and collect_thread.is_alive():
+            # the running record step closes the collector when it returns
+            active.stop()
+        else:
+            _close_collector(active)
     label_collect_status.config(text="Stopped.")
     _set_collect_button(starting=False)
 
@@ -963,6 +1107,7 @@ def run_collect_step(index_: int):
     if index_ >= len(steps):
         _cancel_scheduled()
         label_collect_status.config(text="Finished.")
+        _close_collector()
         collecting = False
         collect_stop = False
         collection_order = None
@@ -980,6 +1125,7 @@ def show_collect_countdown(
 
     When the countdown reaches zero, starts recording for the given pose.
     """
+    global collect_thread
     if collect_stop:
         return
     if n == 0:
@@ -987,11 +1133,12 @@ def show_collect_countdown(
             text=f"Rec: {pose_name} ({int(seconds)}s)"
             )
         if not collect_stop:
-            threading.Thread(
+            collect_thread = threading.Thread(
                 target=record_collect_pose,
                 args=(pose_name, seconds, index_),
                 daemon=True
-                ).start()
+                )
+            collect_thread.start()
             show_recording_countdown(int(seconds), pose_name, index_)
         return
 
@@ -1017,27 +1164,30 @@ def show_recording_countdown(remaining: int, pose_name: str, index_: int):
 def record_collect_pose(pose_name: str, seconds: float, index_: int):
     """Record pose samples for the given duration and schedule the next step.
 
-    This function runs in a worker thread and calls collect.main()
-    with appropriate CLI arguments.
+    This function runs in a worker thread and records with the run's
+    long-lived `collect.Collector`, which flushes the samples of the step
+    as one shard.
     """
-    if collect_stop:
+    active = collector
+    if collect_stop or active is None:
         return
-    global current_run_csv
-    # Lazy-import to avoid heavy MediaPipe dependency during app startup.
-    from super_mario_motion import collect as _collect
-    sys.argv = [
-        "collect.py",
-        "--label", pose_name,
-        "--seconds", str(seconds),
-        "--csv", current_run_csv,
-        "--fps", str(Settings.webcam_fps),
-        "--source", "auto",
-        ]
-    _collect.main()
-    if not collect_stop:
+    active.record(pose_name, seconds)
+    if collect_stop:
+        _close_collector(active)
+    else:
         _schedule_after(500, lambda: run_collect_step(index_ + 1))
 
 
+def _close_collector(active=None):
+    """Close `active` (default: the current collector) and forget it."""
+    global collector
+    active = active or collector
+    if active is not None:
+        active.close()
+    if collector is active:
+        collector = None
+
+
 # Takes in a Path and opens this path as a file in the default browser
 def open_browser(path):
     webbrowser.open_new_tab(path.as_uri())
@@ -1171,6 +1321,13 @@ def close():
             ) as e:
         print("Camera shutdown warning:", e)
 
+    data_folder = state_manager.get_data_folder_path()
+    if latency.histograms and data_folder:
+        try:
+            latency.dump_json(Path(data_folder) / LATENCY_FILE_NAME)
+        except OSError as e:
+            print("Latency dump warning:", e)
+
     window.destroy()
 
 
@@ -2,16 +2,25 @@
 Maps pose labels to keyboard inputs and sends them to the active game.
 
 Loads control schemes (including a custom mapping from config), runs a
-background loop that reads the current pose and send-permission from
-StateManager, and presses/releases keys via pyautogui accordingly.
+background loop that wakes up when the current pose or send-permission in
+StateManager changes, and presses/releases keys through the configured
+backend (pyautogui by default, see input_backends) accordingly.
+Timed actions (jump, swim tap) schedule their key-ups instead of sleeping,
+so the loop keeps reacting to new poses while a jump is held. The active
+control scheme is compiled into a pose -> PoseAction table with resolved
+key names whenever it changes, so sending a pose is a single lookup.
 """
 
+import heapq
+import itertools
 import json
 import sys
 import threading
 import time
+from dataclasses import dataclass
 from pathlib import Path
 
+from super_mario_motion import input_backends, latency
 from super_mario_motion.settings import Settings
 from super_mario_motion.state import StateManager
 
@@ -38,12 +47,35 @@ CONTROL_SCHEMES = {
     }
 alphabet_len = 26
 
-if sys.platform == "win32":
-    import pydirectinput as pyautogui
-else:
-    import pyautogui
-
 mapping = None
+# input_backends.KeyBackend the key events are sent to
+backend = None
+
+# placeholder in PoseAction.taps for the current walking direction
+ORIENTATION = None
+
+
+@dataclass(frozen=True)
+class PoseAction:
+    """Precompiled key events of one pose for one control scheme.
+
+    Attributes:
+        held: Keys held while the pose lasts.
+        taps: Keys pressed now and released after `tap_duration`;
+            ORIENTATION stands for the last walking direction.
+        tap_duration: Seconds until the taps are released.
+        orientation: New walking direction key, None to keep it.
+    """
+    held: tuple = ()
+    taps: tuple = ()
+    tap_duration: float = 0.0
+    orientation: str | None = None
+
+
+# pose -> PoseAction of the active scheme and the StateManager key mapping
+# version it was compiled for; replaced as a whole on scheme changes
+action_table = {}
+action_table_version = -1
 
 # Set initial values
 send_permission = False
@@ -54,6 +86,14 @@ pose = "standing"
 currently_held_keys = []
 last_orientation = "right"
 
+# Timed key-ups: heap of (due time, sequence, key) and the valid due time
+# per key. Keys due at the same time are released in the order they were
+# pressed. Tapping a key again reschedules its release, the old heap entry
+# is then skipped as stale.
+pending_releases = []
+release_due = {}
+_release_seq = itertools.count()
+
 # Swimming repeat press configuration
 last_swim_press_time = 0.0
 PDI_LETTER_MAP = {}
@@ -111,60 +151,116 @@ def init():
 
     # Load the scheme of the config
     load_custom_keymap()
+    rebuild_action_table()
+
+    print(f"{module_prefix} key backend: {get_backend().name}.")
 
     thread = threading.Thread(target=input_loop, daemon=True)
     thread.start()
 
 
 def input_loop():
-    """Continuously read pose/state and send corresponding key events.
+    """Send key events whenever the pose or send permission changes.
+
+    Blocks on `StateManager.wait_for_input_change`, waking up early only
+    for pending timed releases and swim repeats, and applies the changes
+    via `update_inputs`.
+    """
+    print(Path(__file__).name + " initialized")
+    version = -1
+    while True:
+        now = time.monotonic()
+        update_inputs(now)
+        version = state_manager.wait_for_input_change(
+            version, timeout=next_wakeup(now)
+            )
+
+
+def update_inputs(now: float | None = None):
+    """Read pose/state and send the corresponding key events.
 
     Logic:
+      * Recompile the action table if the key mapping changed.
       * Read current pose (simple or full-body depending on mode).
       * Read send_permission from StateManager.
       * On send_permission rising edge: send input for current pose.
-      * On pose change while permission is active: release previous keys,
-        send input for the new pose.
-      * On send_permission falling edge: release all currently held keys.
+      * On pose change while permission is active: send input for the new
+        pose, releasing and pressing only the keys that differ, and record
+        the latency since the frame that produced the pose was captured.
+      * While swimming: repeat the swim tap every `Settings.swim_interval`.
+      * On send_permission falling edge: release all currently held keys
+        and the keys of unfinished timed actions.
+      * Release the keys of timed actions (jump, swim tap) when due.
+
+    Args:
+        now: Current time.monotonic(), looked up if not given.
     """
-    print(Path(__file__).name + " initialized")
     global pose, last_pose, mapping, send_permission, \
         previous_send_permission, last_swim_press_time
-    while True:
-        pose = state_manager.get_pose_full_body() if (
-                state_manager.get_current_mode() ==
-                "Full-body") else state_manager.get_pose()
-        send_permission = state_manager.get_send_permission()
-        if send_permission:
-            if not previous_send_permission:
-                # When send_permission just changed from False to True
-                press_designated_input(pose)
-                last_pose = pose
-                previous_send_permission = True
-                # Reset swim timer when starting to send
-                last_swim_press_time = time.time()
-            if last_pose != pose:
-                release_held_keys()
-                last_pose = pose
-                press_designated_input(pose)
-                # Reset swim timer on pose change
-                if pose == "swimming":
-                    last_swim_press_time = time.time()
-            # While holding a swimming pose, repeatedly tap the swim button
+    if now is None:
+        now = time.monotonic()
+    if state_manager.get_key_mapping_version() != action_table_version:
+        rebuild_action_table()
+    pose = state_manager.get_pose_full_body() if (
+            state_manager.get_current_mode() ==
+            "Full-body") else state_manager.get_pose()
+    send_permission = state_manager.get_send_permission()
+    if send_permission:
+        if not previous_send_permission:
+            # When send_permission just changed from False to True
+            press_designated_input(pose, now)
+            last_pose = pose
+            previous_send_permission = True
+            # Reset swim timer when starting to send
+            last_swim_press_time = now
+        if last_pose != pose:
+            last_pose = pose
+            dispatch_start = time.perf_counter()
+            press_designated_input(pose, now)
+            _record_key_latency(dispatch_start)
+            # Reset swim timer on pose change
             if pose == "swimming":
-                now = time.time()
-                if now - last_swim_press_time >= Settings.swim_interval:
-                    press_designated_input("swimming")
-                    last_swim_press_time = now
-        elif previous_send_permission:
-            # When send_permission just changed from True to False
-            release_held_keys()
-            previous_send_permission = False
-
-        time.sleep(0.02)
+                last_swim_press_time = now
+        # While holding a swimming pose, repeatedly tap the swim button
+        if pose == "swimming":
+            if now - last_swim_press_time >= Settings.swim_interval:
+                press_designated_input("swimming", now)
+                last_swim_press_time = now
+    elif previous_send_permission:
+        # When send_permission just changed from True to False
+        release_held_keys()
+        release_pending_keys()
+        previous_send_permission = False
+
+    process_due_releases(now)
+
+
+def _record_key_latency(dispatch_start: float):
+    """Record the dispatch time and the capture-to-key latency of the
+    frame that produced the current pose."""
+    sent = time.perf_counter()
+    latency.record("input_dispatch", sent - dispatch_start)
+    full_body = state_manager.get_current_mode() == "Full-body"
+    _, captured_at = state_manager.get_pose_origin(full_body)
+    latency.record_since("capture_to_key", captured_at, sent)
+
+
+def next_wakeup(now: float):
+    """Return the seconds until the input loop has timed work, or None.
+
+    Timed work is the next pending key release and, while swimming with
+    send permission, the next swim tap.
+    """
+    due = next_release_time()
+    if previous_send_permission and last_pose == "swimming":
+        swim_due = last_swim_press_time + Settings.swim_interval
+        due = swim_due if due is None else min(due, swim_due)
+    if due is None:
+        return None
+    return max(0.0, due - now)
 
 
-def _key_down(key: str):
+def _resolve_key(key: str) -> str:
     # Normalize single-letter keys to physical US positions where possible,
     # so custom mappings behave consistently across keyboard layouts.
     if isinstance(key, str) and len(key) == 1 and key.isalpha():
@@ -172,104 +268,209 @@ def _key_down(key: str):
         if sys.platform == "win32":
             mapped = PDI_LETTER_MAP.get(k)
             if mapped:
-                pyautogui.keyDown(mapped)
-                return
+                return mapped
         if sys.platform == "darwin":
             mapped = DARWIN_LETTER_MAP.get(k)
             if mapped:
-                pyautogui.keyDown(mapped)
-                return
+                return mapped
+    return key
 
-    pyautogui.keyDown(key)
+
+def _key_down(key: str):
+    get_backend().key_down(key)
 
 
 def _key_up(key: str):
-    if isinstance(key, str) and len(key) == 1 and key.isalpha():
-        k = key.lower()
-        if sys.platform == "win32":
-            mapped = PDI_LETTER_MAP.get(k)
-            if mapped:
-                pyautogui.keyUp(mapped)
-                return
-        if sys.platform == "darwin":
-            mapped = DARWIN_LETTER_MAP.get(k)
-            if mapped:
-                pyautogui.keyUp(mapped)
-                return
+    get_backend().key_up(key)
+
+
+def compile_action_table(mapping_):
+    """Compile a key mapping into a pose -> PoseAction table.
+
+    Key names are resolved for the current OS/keyboard layout here, so
+    the returned actions can be sent without further lookups.
+
+    Args:
+        mapping_: Key mapping with "jump", "run_throw", "left", "right"
+            and "down" entries.
+
+    Returns:
+        dict[str, PoseAction]: Action of every pose with an input.
+    """
+    key = {name: _resolve_key(k) for name, k in mapping_.items()}
+    jump, run_throw = key["jump"], key["run_throw"]
+    left, right, down = key["left"], key["right"], key["down"]
+    return {
+        "standing": PoseAction(),
+        "jumping": PoseAction(
+            taps=(jump, ORIENTATION), tap_duration=Settings.jump_duration
+            ),
+        "running_right": PoseAction(
+            held=(run_throw, right), orientation=right
+            ),
+        "running_left": PoseAction(held=(run_throw, left), orientation=left),
+        "walking_right": PoseAction(held=(right,), orientation=right),
+        "walking_left": PoseAction(held=(left,), orientation=left),
+        "crouching": PoseAction(held=(down,)),
+        "throwing": PoseAction(
+            taps=(run_throw,), tap_duration=Settings.throw_tap_duration
+            ),
+        "swimming": PoseAction(
+            taps=(ORIENTATION, jump),
+            tap_duration=Settings.swim_tap_duration
+            ),
+        }
+
+
+def rebuild_action_table():
+    """Compile the current key mapping and swap in the new table."""
+    global action_table, action_table_version
+    version = state_manager.get_key_mapping_version()
+    action_table = compile_action_table(get_current_key_mapping())
+    action_table_version = version
+    get_backend().prepare(action_table_keys())
+
+
+def action_table_keys():
+    """Return every key the current action table can send."""
+    keys = set()
+    for action in action_table.values():
+        keys.update(action.held)
+        keys.update(key for key in action.taps if key is not ORIENTATION)
+    return sorted(keys)
+
+
+def get_backend():
+    """Return the key-output backend, creating the configured one first."""
+    global backend
+    if backend is None:
+        backend = input_backends.create_backend(Settings.input_backend)
+    return backend
+
+
+def set_backend(new_backend):
+    """Replace the key-output backend, e.g. with a RecordingBackend."""
+    global backend
+    backend = new_backend
+    backend.prepare(action_table_keys())
+
+
+def set_held_keys(keys):
+    """Hold exactly `keys`, sending only the necessary key events.
+
+    Keys that are held but not wanted are released first, then the
+    missing keys are pressed. Keys held by both the old and the new pose
+    (e.g. `right` from running_right to walking_right) are not touched.
 
-    pyautogui.keyUp(key)
+    Args:
+        keys: Keys that should be held afterwards.
+    """
+    global currently_held_keys
+    for key in currently_held_keys:
+        if key not in keys:
+            _key_up(key)
+    for key in keys:
+        if key not in currently_held_keys:
+            _key_down(key)
+    currently_held_keys = list(keys)
 
 
-def press_designated_input(pose_):
-    """Send key presses according to the given pose label.
+def press_designated_input(pose_, now: float | None = None):
+    """Send key events according to the given pose label.
 
-    This function both triggers momentary actions (jump, throw) and sets
-    up continuous key holds (walking/running/crouching), which are
-    tracked in `currently_held_keys`.
+    This function sets up continuous key holds (walking/running/
+    crouching) by diffing against `currently_held_keys`, and triggers
+    momentary actions (jump, throw, swim), whose key-ups are scheduled via
+    `tap_keys`. The keys come from the precompiled `action_table`. It
+    never blocks.
 
     Args:
         pose_: Pose label (e.g. "walking_right", "jumping").
+        now: Current time.monotonic() for scheduling the key-ups of timed
+            actions, looked up if not given.
     """
-    global currently_held_keys, last_orientation
-
-    mapping_ = get_current_key_mapping()
-    jump = mapping_["jump"]
-    run_throw = mapping_["run_throw"]
-    left = mapping_["left"]
-    right = mapping_["right"]
-    down = mapping_["down"]
-
-    match pose_:
-        case "standing":
-            pass
-        case "jumping":
-            _key_down(jump)
-            _key_down(last_orientation)
-            time.sleep(0.5)
-            _key_up(last_orientation)
-            _key_up(jump)
-        case "running_right":
-            _key_down(run_throw)
-            _key_down(right)
-            currently_held_keys.append(run_throw)
-            currently_held_keys.append(right)
-            last_orientation = right
-        case "running_left":
-            _key_down(run_throw)
-            _key_down(left)
-            currently_held_keys.append(run_throw)
-            currently_held_keys.append(left)
-            last_orientation = left
-        case "walking_right":
-            _key_down(right)
-            currently_held_keys.append(right)
-            last_orientation = right
-        case "walking_left":
-            _key_down(left)
-            currently_held_keys.append(left)
-            last_orientation = left
-        case "crouching":
-            _key_down(down)
-            currently_held_keys.append(down)
-        case "throwing":
-            _key_down(run_throw)
-            _key_up(run_throw)
-        case "swimming":
-            _key_down(last_orientation)
-            _key_down(jump)
-            time.sleep(0.05)
-            _key_up(last_orientation)
-            _key_up(jump)
-
-        case _:
-            print(f"{module_prefix} No input defined for: " + pose_)
+    global last_orientation
+
+    action = action_table.get(pose_)
+    if action is None:
+        print(f"{module_prefix} No input defined for: " + pose_)
+        return
+
+    set_held_keys(action.held)
+    if action.orientation is not None:
+        last_orientation = action.orientation
+    if action.taps:
+        tap_keys(
+            [last_orientation if key is ORIENTATION else key
+             for key in action.taps],
+            action.tap_duration, now
+            )
 
 
 def release_held_keys():
-    global currently_held_keys
-    for key in currently_held_keys:
-        _key_up(key)
-    currently_held_keys = []
+    set_held_keys([])
+
+
+def tap_keys(keys, duration: float, now: float | None = None):
+    """Press `keys` now and schedule their release after `duration` seconds.
+
+    A key whose earlier tap is still pending is released first, so two
+    quick taps reach the game as two presses instead of one long one.
+
+    Args:
+        keys: Keys to press, in order.
+        duration: Seconds until the keys are released by
+            `process_due_releases`.
+        now: Current time.monotonic(), looked up if not given.
+    """
+    if now is None:
+        now = time.monotonic()
+    due = now + duration
+    for key in keys:
+        if key in release_due and key not in currently_held_keys:
+            _key_up(key)
+        _key_down(key)
+        release_due[key] = due
+        heapq.heappush(pending_releases, (due, next(_release_seq), key))
+
+
+def next_release_time():
+    """Return the due time of the next pending release, or None."""
+    while pending_releases:
+        due, _, key = pending_releases[0]
+        if release_due.get(key) == due:
+            return due
+        heapq.heappop(pending_releases)
+    return None
+
+
+def process_due_releases(now: float | None = None):
+    """Release the keys of timed actions whose duration has passed.
+
+    Keys the current pose holds (e.g. `right` while jumping into
+    walking_right) stay pressed.
+
+    Args:
+        now: Current time.monotonic(), looked up if not given.
+    """
+    if now is None:
+        now = time.monotonic()
+    while pending_releases and pending_releases[0][0] <= now:
+        due, _, key = heapq.heappop(pending_releases)
+        if release_due.get(key) != due:
+            continue  # rescheduled by a later tap
+        del release_due[key]
+        if key not in currently_held_keys:
+            _key_up(key)
+
+
+def release_pending_keys():
+    """Release the keys of all unfinished timed actions immediately."""
+    for key in release_due:
+        if key not in currently_held_keys:
+            _key_up(key)
+    release_due.clear()
+    pending_releases.clear()
 
 
 def build_pydirectinput_letter_map():
@@ -402,6 +603,11 @@ def build_darwin_letter_map():
 
 
 def load_custom_keymap():
+    """Load the custom key mapping from the config file.
+
+    The mapping is also published to the StateManager, which bumps the
+    key mapping version so the input loop recompiles its action table.
+    """
     global CONTROL_SCHEMES
     config_file = state_manager.get_config_path()
     try:
@@ -417,3 +623,4 @@ def load_custom_keymap():
             f" for custom."
             )
         CONTROL_SCHEMES["Custom"] = CONTROL_SCHEMES["Original (RetroArch)"]
+    state_manager.set_custom_key_mapping(CONTROL_SCHEMES["Custom"])
@@ -0,0 +1,255 @@
+"""
+Key-output backends for the input module.
+
+Every backend sends key-down/key-up events for already resolved key names
+("x", "left", "shift", ...):
+
+  * PyAutoGuiBackend: pyautogui (pydirectinput on Windows), the default.
+  * UInputBackend: a virtual Linux keyboard via python-evdev, without
+    pyautogui's per-call overhead. Needs `pip install evdev` and write
+    access to /dev/uinput. Keys without an evdev code are sent with
+    pyautogui instead.
+  * RecordingBackend: records timestamped events in memory instead of
+    sending them, for headless tests and latency measurements.
+"""
+
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+module_prefix = "[InputBackends]"
+
+BACKENDS = ["pyautogui", "uinput", "recording"]
+
+
+class KeyBackend(ABC):
+    """Interface of a key-output backend."""
+
+    name = "none"
+
+    @abstractmethod
+    def key_down(self, key: str):
+        """Press `key`."""
+
+    @abstractmethod
+    def key_up(self, key: str):
+        """Release `key`."""
+
+    def prepare(self, keys):
+        """Look up everything needed to send `keys` ahead of time, so
+        problems are reported when a key mapping is loaded rather than on
+        the first key event. Nothing to do by default."""
+        return
+
+    def close(self):
+        """Release resources held by the backend, if any."""
+        return
+
+
+class PyAutoGuiBackend(KeyBackend):
+    """Send keys with pyautogui, or pydirectinput on Windows.
+
+    Both libraries sleep for their `PAUSE` after every call, which is
+    disabled here since the input module schedules its own timing.
+    """
+
+    name = "pyautogui"
+
+    def __init__(self):
+        if sys.platform == "win32":
+            import pydirectinput as pyautogui
+        else:
+            import pyautogui
+        pyautogui.PAUSE = 0
+        self._pyautogui = pyautogui
+
+    def key_down(self, key: str):
+        self._pyautogui.keyDown(key)
+
+    def key_up(self, key: str):
+        self._pyautogui.keyUp(key)
+
+
+# pyautogui key names whose evdev code is not KEY_<NAME>
+EVDEV_ALIASES = {
+    "shift": "KEY_LEFTSHIFT",
+    "shiftleft": "KEY_LEFTSHIFT",
+    "shiftright": "KEY_RIGHTSHIFT",
+    "ctrl": "KEY_LEFTCTRL",
+    "ctrlleft": "KEY_LEFTCTRL",
+    "ctrlright": "KEY_RIGHTCTRL",
+    "alt": "KEY_LEFTALT",
+    "altleft": "KEY_LEFTALT",
+    "altright": "KEY_RIGHTALT",
+    "return": "KEY_ENTER",
+    "esc": "KEY_ESC",
+    "pageup": "KEY_PAGEUP",
+    "pagedown": "KEY_PAGEDOWN",
+    " ": "KEY_SPACE",
+    ",": "KEY_COMMA",
+    ".": "KEY_DOT",
+    "-": "KEY_MINUS",
+    "=": "KEY_EQUAL",
+    ";": "KEY_SEMICOLON",
+    "'": "KEY_APOSTROPHE",
+    "/": "KEY_SLASH",
+    "\\": "KEY_BACKSLASH",
+    "[": "KEY_LEFTBRACE",
+    "]": "KEY_RIGHTBRACE",
+    "`": "KEY_GRAVE",
+    }
+
+
+def evdev_key_name(key: str) -> str:
+    """Return the evdev code name of a pyautogui key name."""
+    key = key.lower()
+    if key in EVDEV_ALIASES:
+        return EVDEV_ALIASES[key]
+    if key.startswith("num") and key[3:].isdigit():
+        return f"KEY_KP{key[3:]}"
+    return f"KEY_{key.upper()}"
+
+
+class UInputBackend(KeyBackend):
+    """Send keys through a virtual uinput keyboard (Linux only).
+
+    Keys without an evdev code are logged once and sent with pyautogui.
+
+    Raises:
+        ImportError: If python-evdev is not installed.
+        OSError: If /dev/uinput cannot be opened.
+    """
+
+    name = "uinput"
+
+    def __init__(self):
+        from evdev import UInput, ecodes
+
+        self._ecodes = ecodes
+        # key -> evdev code, None for keys sent by the fallback
+        self._codes = {}
+        self._fallback = None
+        self._ui = UInput(name="super-mario-motion")
+
+    def prepare(self, keys):
+        for key in keys:
+            self._code(key)
+
+    def _code(self, key: str) -> int | None:
+        if key not in self._codes:
+            code = getattr(self._ecodes, evdev_key_name(key), None)
+            if code is None:
+                print(
+                    f"{module_prefix} no uinput code for key {key!r}, "
+                    f"sending it with pyautogui."
+                    )
+            self._codes[key] = code
+        return self._codes[key]
+
+    def _get_fallback(self) -> KeyBackend | None:
+        if self._fallback is None:
+            try:
+                self._fallback = PyAutoGuiBackend()
+            except Exception as e:
+                print(f"{module_prefix} pyautogui not available ({e}).")
+                self._fallback = False
+        return self._fallback or None
+
+    def _send(self, key: str, value: int):
+        code = self._code(key)
+        if code is not None:
+            self._ui.write(self._ecodes.EV_KEY, code, value)
+            self._ui.syn()
+            return
+        fallback = self._get_fallback()
+        if fallback is None:
+            return
+        if value:
+            fallback.key_down(key)
+        else:
+            fallback.key_up(key)
+
+    def key_down(self, key: str):
+        self._send(key, 1)
+
+    def key_up(self, key: str):
+        self._send(key, 0)
+
+    def close(self):
+        self._ui.close()
+
+
+@dataclass(frozen=True)
+class KeyEvent:
+    """One recorded key event.
+
+    Attributes:
+        timestamp: time.perf_counter() when the event was sent.
+        action: "down" or "up".
+        key: Resolved key name.
+    """
+    timestamp: float
+    action: str
+    key: str
+
+
+class RecordingBackend(KeyBackend):
+    """Record key events with timestamps instead of sending them."""
+
+    name = "recording"
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def key_down(self, key: str):
+        self._record("down", key)
+
+    def key_up(self, key: str):
+        self._record("up", key)
+
+    def _record(self, action: str, key: str):
+        event = KeyEvent(time.perf_counter(), action, key)
+        with self._lock:
+            self.events.append(event)
+
+    def pressed(self):
+        """Return the keys that are currently down."""
+        down = []
+        with self._lock:
+            for event in self.events:
+                if event.action == "down" and event.key not in down:
+                    down.append(event.key)
+                elif event.action == "up" and event.key in down:
+                    down.remove(event.key)
+        return down
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+
+
+def create_backend(name: str = "pyautogui") -> KeyBackend:
+    """Create the backend `name`, falling back to pyautogui on failure.
+
+    Args:
+        name: One of BACKENDS.
+
+    Returns:
+        KeyBackend: The created backend.
+    """
+    if name == "uinput":
+        try:
+            return UInputBackend()
+        except (ImportError, OSError) as e:
+            print(
+                f"{module_prefix} uinput not available ({e}), "
+                f"using pyautogui."
+                )
+    elif name == "recording":
+        return RecordingBackend()
+    elif name != "pyautogui":
+        print(f"{module_prefix} unknown backend {name}, using pyautogui.")
+    return PyAutoGuiBackend()
@@ -0,0 +1,140 @@
+"""
+Per-stage latency histograms for the motion-to-keypress pipeline.
+
+Every frame is tagged with its capture time (time.perf_counter()) and
+frame id in `vision`, which travel with the landmark snapshot through
+simple and full-body classification to the input module. Each stage
+records its duration here; `summary()` reports p50/p95/p99 per stage for
+the GUI debug panel and `dump_json()` writes them to a file.
+
+Histograms use fixed logarithmic buckets and are written by a single
+thread per stage without locking; readers get a slightly stale but
+consistent-enough view.
+"""
+
+import json
+import math
+from bisect import bisect_right
+from pathlib import Path
+
+module_prefix = "[Latency]"
+
+# bucket edges from 10 µs to ~10 s, 20 buckets per decade (~12% wide)
+MIN_SECONDS = 1e-5
+BUCKETS_PER_DECADE = 20
+N_BUCKETS = 6 * BUCKETS_PER_DECADE
+EDGES = [
+    MIN_SECONDS * 10 ** (i / BUCKETS_PER_DECADE) for i in range(N_BUCKETS)
+    ]
+
+# stages in pipeline order, used to sort the report
+STAGES = [
+    "queue_wait",
+    "pose_inference",
+    "classify_simple",
+    "capture_to_snapshot",
+    "ml_classify",
+    "capture_to_ml_pose",
+    "input_dispatch",
+    "capture_to_key",
+    ]
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations in seconds."""
+
+    def __init__(self):
+        self.counts = [0] * (N_BUCKETS + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect_right(EDGES, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Return the q-th percentile (0-100) in seconds.
+
+        The result is the geometric center of the bucket holding the
+        percentile, i.e. accurate to about ±6%.
+        """
+        if self.count == 0:
+            return math.nan
+        rank = q / 100.0 * self.count
+        seen = 0
+        bucket = N_BUCKETS
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                bucket = i
+                break
+        if bucket == 0:
+            return EDGES[0] / 2
+        if bucket == N_BUCKETS:
+            return self.max
+        return math.sqrt(EDGES[bucket - 1] * EDGES[bucket])
+
+    def stats(self) -> dict:
+        """Return count, mean, p50, p95, p99 and max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1e3 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p95_ms": self.percentile(95) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": self.max * 1e3,
+            }
+
+
+histograms = {}
+
+
+def record(stage: str, seconds: float):
+    """Add one duration in seconds to the histogram of `stage`."""
+    histogram = histograms.get(stage)
+    if histogram is None:
+        histogram = histograms.setdefault(stage, LatencyHistogram())
+    histogram.record(seconds)
+
+
+def record_since(stage: str, start: float, now: float):
+    """Record `now - start` for `stage`, ignoring untagged frames."""
+    if start > 0.0:
+        record(stage, now - start)
+
+
+def summary() -> dict:
+    """Return `LatencyHistogram.stats()` of every recorded stage."""
+    order = {stage: i for i, stage in enumerate(STAGES)}
+    return {
+        stage: histograms[stage].stats()
+        for stage in sorted(
+            list(histograms), key=lambda s: (order.get(s, len(order)), s)
+            )
+        }
+
+
+def format_summary() -> str:
+    """Return the summary as a fixed-width text table."""
+    lines = [f"{'stage':<20}{'n':>7}{'p50':>8}{'p95':>8}{'p99':>8} ms"]
+    for stage, s in summary().items():
+        lines.append(
+            f"{stage:<20}{s['count']:>7}{s['p50_ms']:>8.1f}"
+            f"{s['p95_ms']:>8.1f}{s['p99_ms']:>8.1f}"
+            )
+    return "\n".join(lines)
+
+
+def dump_json(path):
+    """Write the summary to `path` as JSON."""
+    path = Path(path)
+    path.write_text(json.dumps(summary(), indent=4))
+    print(f"{module_prefix} latency summary -> {path}")
+
+
+def reset():
+    histograms.clear()
@@ -0,0 +1,183 @@
+"""
+Compiled NumPy evaluation of the linear SVM pose model.
+
+Folds the StandardScaler of a trained `StandardScaler -> SVC(kernel=
+"linear", probability=True)` pipeline into the one-vs-one weights and
+stores weights, intercepts and Platt parameters as contiguous float32
+arrays. Probabilities are computed the same way libsvm does (pairwise
+Platt scaling and pairwise coupling), but with a few matrix operations
+instead of sklearn's per-call overhead.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+# libsvm clips pairwise probabilities to this range before coupling
+MIN_PROB = 1e-7
+MAX_LOGIT = float(np.log((1.0 - MIN_PROB) / MIN_PROB))
+# length of a StandardScaler -> SVC pipeline
+SCALED_PIPELINE_STEPS = 2
+# sklearn negates the decision function of binary SVCs
+BINARY_CLASSES = 2
+
+
+class CompiledLinearSVM:
+    """Drop-in replacement for the `predict_proba`/`classes_` interface of
+    the trained sklearn pipeline.
+
+    Attributes:
+        classes_: Class labels in the order of the probability columns.
+        coef: Array (n_features, n_pairs) of scaler-folded OvO weights.
+        intercept: Array (n_pairs,) of scaler-folded OvO intercepts.
+        prob_a, prob_b: Arrays (n_pairs,) with the Platt parameters.
+    """
+
+    def __init__(self, classes, coef, intercept, prob_a, prob_b):
+        self.classes_ = np.asarray(classes)
+        self.coef = np.ascontiguousarray(coef, dtype=np.float32)
+        self.intercept = np.ascontiguousarray(intercept, dtype=np.float32)
+        self.prob_a = np.ascontiguousarray(prob_a, dtype=np.float32)
+        self.prob_b = np.ascontiguousarray(prob_b, dtype=np.float32)
+
+        k = len(self.classes_)
+        # libsvm orders the pairs (0, 1), (0, 2), ..., (1, 2), ...
+        self._pair_i, self._pair_j = np.triu_indices(k, 1)
+        # one-hot maps from pairs to their first/second class
+        self._first = np.eye(k, dtype=np.float32)[self._pair_i]
+        self._second = np.eye(k, dtype=np.float32)[self._pair_j]
+        # flat positions of Q[i, j], Q[j, i] and Q[t, t] in the bordered
+        # (k + 1, k + 1) coupling system
+        self._upper = self._pair_i * (k + 1) + self._pair_j
+        self._lower = self._pair_j * (k + 1) + self._pair_i
+        self._diag = np.arange(k) * (k + 2)
+        self._system = np.zeros((1, k + 1, k + 1), dtype=np.float64)
+        self._system[0, :k, k] = 1.0
+        self._system[0, k, :k] = 1.0
+        if self.coef.shape[1] != len(self._pair_i):
+            raise ValueError(
+                f"expected {len(self._pair_i)} pairwise classifiers for "
+                f"{k} classes, got {self.coef.shape[1]}"
+                )
+
+    @classmethod
+    def from_pipeline(cls, model):
+        """Compile a trained sklearn model.
+
+        Args:
+            model: Either a fitted `SVC(kernel="linear", probability=True)`
+                or a Pipeline of an optional StandardScaler followed by
+                such an SVC.
+
+        Returns:
+            CompiledLinearSVM: The compiled model.
+
+        Raises:
+            ValueError: If the model cannot be expressed as a linear OvO
+                SVM with Platt scaling.
+        """
+        scaler = None
+        clf = model
+        steps = getattr(model, "steps", None)
+        if steps is not None:
+            if len(steps) == SCALED_PIPELINE_STEPS:
+                scaler, clf = steps[0][1], steps[1][1]
+            elif len(steps) == 1:
+                clf = steps[0][1]
+            else:
+                raise ValueError(f"unsupported pipeline: {model}")
+
+        if getattr(clf, "kernel", None) != "linear":
+            raise ValueError(f"only linear SVC models can be compiled: {clf}")
+        prob_a = getattr(clf, "probA_", None)
+        if prob_a is None or len(prob_a) == 0:
+            raise ValueError("SVC was not trained with probability=True")
+
+        coef = np.asarray(clf.coef_, dtype=np.float64)
+        intercept = np.asarray(clf.intercept_, dtype=np.float64)
+        if len(clf.classes_) == BINARY_CLASSES:
+            # sklearn flips the sign of the binary decision function
+            coef, intercept = -coef, -intercept
+
+        if scaler is not None:
+            mean = getattr(scaler, "mean_", None)
+            scale = getattr(scaler, "scale_", None)
+            if scale is not None:
+                coef = coef / scale
+            if mean is not None:
+                intercept = intercept - coef @ mean
+
+        return cls(clf.classes_, coef.T, intercept, prob_a, clf.probB_)
+
+    @classmethod
+    def load(cls, path):
+        """Load a compiled model written by `save`."""
+        with np.load(Path(path), allow_pickle=False) as data:
+            return cls(
+                data["classes"], data["coef"], data["intercept"],
+                data["prob_a"], data["prob_b"]
+                )
+
+    def save(self, path):
+        """Write the compiled model as an uncompressed .npz archive."""
+        np.savez(
+            Path(path),
+            classes=self.classes_.astype(str),
+            coef=self.coef,
+            intercept=self.intercept,
+            prob_a=self.prob_a,
+            prob_b=self.prob_b,
+            )
+
+    def decision_function(self, x):
+        """Return the pairwise (OvO) decision values, shape (n, n_pairs)."""
+        x = np.asarray(x, dtype=np.float32).reshape(-1, self.coef.shape[0])
+        return x @ self.coef + self.intercept
+
+    def predict_proba(self, x):
+        """Return class probabilities of shape (n_samples, n_classes)."""
+        z = self.decision_function(x)
+        z *= self.prob_a
+        z += self.prob_b
+
+        # pairwise Platt probability 1 / (1 + exp(z)); clipping z is the
+        # same as clipping the probability to [MIN_PROB, 1 - MIN_PROB]
+        np.maximum(z, -MAX_LOGIT, out=z)
+        np.minimum(z, MAX_LOGIT, out=z)
+        np.exp(z, out=z)
+        z += 1.0
+        pairwise = np.reciprocal(z, out=z)
+
+        # Pairwise coupling (Wu, Lin and Weng), as done by libsvm: p
+        # minimizes p^T Q p subject to sum(p) = 1, with
+        # Q[t, t] = sum_j r[j, t]^2 and Q[t, j] = -r[j, t] * r[t, j], where
+        # r[i, j] = pairwise and r[j, i] = 1 - pairwise. Negating Q does not
+        # change p, so -Q is assembled directly into the bordered system
+        # [[-Q, 1], [1^T, 0]] whose inverse holds p in its last row.
+        n, k = len(z), len(self.classes_)
+        complement = 1.0 - pairwise
+        off_diag = pairwise * complement
+        diag = -(pairwise * pairwise) @ self._second
+        diag -= (complement * complement) @ self._first
+
+        system = np.repeat(self._system, n, axis=0)
+        flat = system.reshape(n, -1)
+        flat[:, self._upper] = off_diag
+        flat[:, self._lower] = off_diag
+        flat[:, self._diag] = diag
+        return np.linalg.inv(system)[:, k, :k]
+
+    def predict(self, x):
+        """Return the most probable class label for each sample."""
+        return self.classes_[np.argmax(self.predict_proba(x), axis=1)]
+
+
+def compile_model(model):
+    """Compile `model` if possible, otherwise return it unchanged."""
+    if isinstance(model, CompiledLinearSVM):
+        return model
+    try:
+        return CompiledLinearSVM.from_pipeline(model)
+    except (ValueError, AttributeError) as e:
+        print(f"[linear_svm] model not compiled, using sklearn: {e}")
+        return model
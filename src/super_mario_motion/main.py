@@ -28,6 +28,12 @@ from super_mario_motion.state import StateManager
 gui_cams_available = []
 cams_available = []
 
+# GUI refresh scheduling: version of every source last shown in the GUI,
+# the current tick delay and the pending `after` id
+shown_versions = {}
+idle_delay_ms = Settings.gui_update_ms
+update_after_id = None
+
 
 # --- macOS camera permission helper ---
 def _ensure_macos_camera_permission() -> str:
@@ -371,59 +377,112 @@ def _start_heavy_init_async(on_ready):
     threading.Thread(target=_worker, daemon=True).start()
 
 
-# Function gets called every millisecond after the mainloop of the tkinter ui
+def bind_gui_state():
+    """Write the GUI settings into the StateManager whenever they change.
+
+    Uses Tk variable traces instead of copying the values on every tick,
+    and requests an immediate GUI refresh so the change shows up without
+    waiting for an idle tick.
+    """
+    bindings = [
+        (gui.selected_mode, state_manager.set_current_mode),
+        (gui.selected_control_scheme, state_manager.set_control_scheme),
+        (gui.send_keystrokes, state_manager.set_send_permission),
+        (gui.selected_preview, None),
+        (gui.allow_debug_info, None),
+        ]
+    for variable, setter in bindings:
+        def _on_write(*_, variable_=variable, setter_=setter):
+            if setter_ is not None:
+                setter_(variable_.get())
+            schedule_update(0)
+
+        _on_write()
+        variable.trace_add("write", _on_write)
+
+
+def schedule_update(delay_ms):
+    """(Re)schedule the next `update` call in `delay_ms` milliseconds."""
+    global update_after_id
+    if update_after_id is not None:
+        gui.window.after_cancel(update_after_id)
+    update_after_id = gui.window.after(delay_ms, update)
+
+
+def source_changed(name, version):
+    """Return True (once) if the source `name` has a new version."""
+    if shown_versions.get(name) == version:
+        return False
+    shown_versions[name] = version
+    return True
+
+
+# Function gets called periodically after the mainloop of the tkinter ui
 def update():
     """Main update loop that synchronizes state, vision and GUI.
 
     This function:
-      * Writes GUI settings (mode, send inputs) into the StateManager.
-      * Retrieves current pose predictions.
-      * Updates camera images via `vision` and displays them in the GUI.
-      * Updates pose preview image/text/debug information.
-      * Updates the virtual gamepad visualizer.
-      * Reschedules itself with `gui.window.after(1, update)`.
+      * Updates camera images via `vision` and displays them in the GUI
+        when a new camera frame arrived.
+      * Updates pose preview image/text and the virtual gamepad
+        visualizer when the pose, mode or send permission changed.
+      * Updates debug information when new landmarks arrived, including
+        the latency percentiles per pipeline stage.
+      * Reschedules itself after `Settings.gui_update_ms` while something
+        changes, backing off up to `Settings.gui_idle_update_ms` while
+        nothing moves.
+
+    GUI settings are written into the StateManager by the traces set up
+    in `bind_gui_state`.
     """
-
-    # Write GUI information into state
-    state_manager.set_current_mode(gui.selected_mode.get())
-    state_manager.set_control_scheme(gui.selected_control_scheme.get())
-    state_manager.set_send_permission(gui.send_keystrokes.get())
-
-    # Retrieve predicted poses
-    current_pose = state_manager.get_pose()
-    current_pose_full_body = state_manager.get_pose_full_body()
+    global idle_delay_ms, update_after_id
+    update_after_id = None
+    changed = False
 
     # Update Images to display in gui.py
     try:
         if "vision" in globals():
-            vision.update_images()
+            vision.update_images(gui.selected_preview.get())
     except Exception:
         pass
-    gui.set_webcam_image(*state_manager.get_all_opencv_images())
-
-    # Update Pose Preview Indicator in gui.py
-    gui.update_pose(
-        current_pose_full_body
-        if state_manager.get_current_mode() == "Full-body"
-        else current_pose
-        )
-    gui.update_pose_image()
-    gui.update_pose_text()
-    gui.update_debug_landmarks(state_manager.get_landmark_string())
-
-    # Update virtual gamepad visualizer
-    pose_for_gamepad = (
-        current_pose_full_body
-        if state_manager.get_current_mode() == "Full-body"
-        else current_pose
-    )
-    send_active = state_manager.get_send_permission()
-    gamepad_img = gamepad_visualizer.create_gamepad_image(
-        pose_for_gamepad, send_active=send_active
+    if source_changed("webcam", state_manager.get_opencv_image_frame_id()):
+        changed = True
+    # also redraws on preview mode or scale changes
+    gui.set_webcam_image(
+        *state_manager.get_all_opencv_images(),
+        state_manager.get_opencv_image_frame_id()
         )
-    gui.set_gamepad_image(gamepad_img)
 
-    gui.window.after(Settings.gui_update_ms, update)
+    # Update Pose Preview Indicator and virtual gamepad in gui.py
+    if source_changed("input", state_manager.get_input_version()):
+        changed = True
+        if state_manager.get_current_mode() == "Full-body":
+            current_pose = state_manager.get_pose_full_body()
+        else:
+            current_pose = state_manager.get_pose()
+        gui.update_pose(current_pose)
+        gui.update_pose_image()
+        gui.update_pose_text()
+        gui.set_gamepad_buttons(
+            gamepad_visualizer.pressed_buttons(
+                current_pose,
+                send_active=state_manager.get_send_permission()
+                )
+            )
+
+    # the landmark string is only built while debug info is shown
+    debug = gui.allow_debug_info.get()
+    debug_version = state_manager.get_snapshot().version if debug else None
+    if source_changed("debug", debug_version):
+        changed = True
+        gui.update_debug_landmarks(vision.landmark_string() if debug else "")
+    gui.update_debug_latency()
+
+    if changed:
+        idle_delay_ms = Settings.gui_update_ms
+    else:
+        idle_delay_ms = min(2 * idle_delay_ms, Settings.gui_idle_update_ms)
+    schedule_update(idle_delay_ms)
 
 
 if __name__ == "__main__":
@@ -477,7 +536,7 @@ if __name__ == "__main__":
                 pass
 
         # Start periodic updates once heavy init finished (even with errors)
-        gui.window.after(0, update)
+        bind_gui_state()
 
 
     # Start heavy subsystems in the background
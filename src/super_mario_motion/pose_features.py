@@ -3,7 +3,9 @@ Compute normalized pose features from MediaPipe landmark arrays.
 
 Provides angle, distance, and normalized coordinate features centered at
 the mid-hip, scaled by torso length, and augmented with joint angles and
-pairwise distances plus visibility values.
+pairwise distances plus visibility values. Features can be computed for a
+single frame, fully vectorized for a whole batch of frames, or in place
+into preallocated buffers for the per-frame hot path.
 """
 
 import numpy as np
@@ -17,6 +19,37 @@ hip_left, hip_right = 23, 24
 knee_left, knee_right = 25, 26
 ankle_left, ankle_right = 27, 28
 
+# (a, b, c) landmark triplets, the angle is measured at b
+ANGLE_TRIPLETS = np.array(
+    [
+        (shoulder_left, elbow_left, wrist_left),
+        (shoulder_right, elbow_right, wrist_right),
+        (hip_left, knee_left, ankle_left),
+        (hip_right, knee_right, ankle_right),
+        ]
+    )
+
+# landmark pairs whose distance is used as a feature
+DIST_PAIRS = np.array(
+    [
+        (shoulder_left, shoulder_right),
+        (hip_left, hip_right),
+        (wrist_left, wrist_right),
+        (ankle_left, ankle_right),
+        (shoulder_left, hip_left),
+        (shoulder_right, hip_right),
+        ]
+    )
+
+# Single-frame features mix float32 scalars with Python floats, which
+# promotes to float64 on NumPy 1.x and stays float32 on NumPy 2. The batch
+# path applies the same promotion so both round identically.
+_SCALAR_DTYPE = (np.float32(1) + 1e-6).dtype
+
+
+def _promote(arr):
+    return arr.astype(np.result_type(arr.dtype, _SCALAR_DTYPE))
+
 
 def _mid(a, b):
     return (a + b) / 2.0
@@ -93,3 +126,172 @@ def extract_features(lm_arr: np.ndarray) -> np.ndarray:
         )
     vis = lm_arr[:, 3].astype(np.float32)
     return np.concatenate([xy.flatten(), angles, dists, vis], axis=0)
+
+
+def extract_features_batch(lm: np.ndarray) -> np.ndarray:
+    """Extract feature vectors for many frames at once.
+
+    Vectorized version of `extract_features` that produces bit-identical
+    rows, e.g. to re-featurize a whole recorded dataset.
+
+    Args:
+        lm: Array of shape (n_frames, N, 4) with [x, y, z, visibility] for
+            each landmark of each frame.
+
+    Returns:
+        np.ndarray: 2D array of shape (n_frames, n_features), one
+            `extract_features` vector per frame.
+    """
+    lm = np.asarray(lm)
+    xy = lm[:, :, :2].copy()
+    mid_hip = _mid(xy[:, hip_left], xy[:, hip_right])
+    xy -= mid_hip[:, None]
+    mid_sh = _mid(xy[:, shoulder_left], xy[:, shoulder_right])
+    torso = _promote(np.linalg.norm(mid_sh, axis=-1)) + 1e-6
+    xy /= torso.astype(xy.dtype)[:, None, None]
+
+    a = xy[:, ANGLE_TRIPLETS[:, 0]]
+    b = xy[:, ANGLE_TRIPLETS[:, 1]]
+    c = xy[:, ANGLE_TRIPLETS[:, 2]]
+    ba, bc = a - b, c - b
+    norm_ba = np.linalg.norm(ba, axis=-1)
+    norm_bc = np.linalg.norm(bc, axis=-1)
+    degenerate = (norm_ba == 0) | (norm_bc == 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        angle_cosine = np.einsum("...i,...i", ba, bc) / (norm_ba * norm_bc)
+    angle_cosine = np.clip(_promote(angle_cosine), -1.0, 1.0)
+    angles = np.degrees(np.arccos(angle_cosine))
+    angles = np.where(degenerate, 0.0, angles).astype(np.float32)
+
+    dists = np.linalg.norm(
+        xy[:, DIST_PAIRS[:, 0]] - xy[:, DIST_PAIRS[:, 1]], axis=-1
+        ).astype(np.float32)
+    vis = lm[:, :, 3].astype(np.float32)
+    return np.concatenate(
+        [xy.reshape(len(xy), -1), angles, dists, vis], axis=1
+        )
+
+
+class FeatureExtractor:
+    """Single-frame feature extraction into preallocated buffers.
+
+    Produces the same vector as `extract_features` for float32 landmarks,
+    but owns its output buffer and all scratch arrays and fills them in
+    place, so the per-frame hot path does not allocate new arrays.
+
+    Attributes:
+        out: The preallocated float32 feature vector filled by `extract`.
+    """
+
+    def __init__(self, n_landmarks: int = 33):
+        n_angles, n_dists = len(ANGLE_TRIPLETS), len(DIST_PAIRS)
+        self.out = np.empty(
+            2 * n_landmarks + n_angles + n_dists + n_landmarks,
+            dtype=np.float32
+            )
+        self._views = self._split(self.out, n_landmarks)
+
+        # precomputed (a, b, c) index arrays and distance pair indices
+        self._tri_a = ANGLE_TRIPLETS[:, 0].copy()
+        self._tri_b = ANGLE_TRIPLETS[:, 1].copy()
+        self._tri_c = ANGLE_TRIPLETS[:, 2].copy()
+        self._pair_i = DIST_PAIRS[:, 0].copy()
+        self._pair_j = DIST_PAIRS[:, 1].copy()
+
+        # scratch arrays
+        self._point = np.empty(2, dtype=np.float32)
+        self._a = np.empty((n_angles, 2), dtype=np.float32)
+        self._b = np.empty((n_angles, 2), dtype=np.float32)
+        self._c = np.empty((n_angles, 2), dtype=np.float32)
+        self._sq = np.empty((n_angles, 2), dtype=np.float32)
+        self._norm_ba = np.empty(n_angles, dtype=np.float32)
+        self._norm_bc = np.empty(n_angles, dtype=np.float32)
+        self._dot = np.empty(n_angles, dtype=np.float32)
+        self._cosine = np.zeros(n_angles, dtype=np.float32)
+        self._degrees = np.empty(
+            n_angles, dtype=np.result_type(np.float32, _SCALAR_DTYPE)
+            )
+        self._valid = np.empty(n_angles, dtype=bool)
+        self._invalid = np.empty(n_angles, dtype=bool)
+        self._pi = np.empty((n_dists, 2), dtype=np.float32)
+        self._pj = np.empty((n_dists, 2), dtype=np.float32)
+
+    @staticmethod
+    def _split(buffer, n_landmarks):
+        n_angles, n_dists = len(ANGLE_TRIPLETS), len(DIST_PAIRS)
+        end_xy = 2 * n_landmarks
+        end_angles = end_xy + n_angles
+        end_dists = end_angles + n_dists
+        return (
+            buffer[:end_xy].reshape(n_landmarks, 2),
+            buffer[end_xy:end_angles],
+            buffer[end_angles:end_dists],
+            buffer[end_dists:],
+            )
+
+    def extract(self, lm_arr: np.ndarray, out: np.ndarray | None = None):
+        """Fill a feature vector for one frame.
+
+        Args:
+            lm_arr: Array of shape (N, 4) with [x, y, z, visibility] for
+                each landmark.
+            out: Optional float32 array to fill instead of `self.out`.
+
+        Returns:
+            np.ndarray: The filled feature vector (`out` or `self.out`).
+                It is overwritten by the next call.
+        """
+        if out is None:
+            out = self.out
+            xy, angles, dists, vis = self._views
+        else:
+            xy, angles, dists, vis = self._split(out, len(lm_arr))
+
+        point = self._point
+        np.add(lm_arr[hip_left, :2], lm_arr[hip_right, :2], out=point)
+        point /= 2.0
+        np.subtract(lm_arr[:, :2], point, out=xy)
+        np.add(xy[shoulder_left], xy[shoulder_right], out=point)
+        point /= 2.0
+        # same operations as np.linalg.norm for a 1D vector
+        torso = np.sqrt(point.dot(point)) + 1e-6
+        xy /= torso
+
+        # joint angles at b for the (a, b, c) triplets
+        a, b, c, sq = self._a, self._b, self._c, self._sq
+        np.take(xy, self._tri_a, axis=0, out=a, mode="clip")
+        np.take(xy, self._tri_b, axis=0, out=b, mode="clip")
+        np.take(xy, self._tri_c, axis=0, out=c, mode="clip")
+        a -= b  # ba
+        c -= b  # bc
+        np.multiply(a, a, out=sq)
+        np.sqrt(sq.sum(axis=1, out=self._norm_ba), out=self._norm_ba)
+        np.multiply(c, c, out=sq)
+        np.sqrt(sq.sum(axis=1, out=self._norm_bc), out=self._norm_bc)
+        np.multiply(a, c, out=sq)
+        sq.sum(axis=1, out=self._dot)
+
+        valid, invalid = self._valid, self._invalid
+        np.not_equal(self._norm_ba, 0, out=valid)
+        np.not_equal(self._norm_bc, 0, out=invalid)
+        np.logical_and(valid, invalid, out=valid)
+        np.logical_not(valid, out=invalid)
+
+        np.multiply(self._norm_ba, self._norm_bc, out=self._norm_ba)
+        np.divide(self._dot, self._norm_ba, out=self._cosine, where=valid)
+        self._degrees[:] = self._cosine
+        np.clip(self._degrees, -1.0, 1.0, out=self._degrees)
+        np.arccos(self._degrees, out=self._degrees)
+        np.degrees(self._degrees, out=self._degrees)
+        np.copyto(angles, self._degrees, casting="same_kind")
+        np.copyto(angles, 0.0, where=invalid)
+
+        # pairwise distances
+        np.take(xy, self._pair_i, axis=0, out=self._pi, mode="clip")
+        np.take(xy, self._pair_j, axis=0, out=self._pj, mode="clip")
+        self._pi -= self._pj
+        np.multiply(self._pi, self._pi, out=self._pi)
+        np.sqrt(self._pi.sum(axis=1, out=dists), out=dists)
+
+        np.copyto(vis, lm_arr[:, 3], casting="same_kind")
+        return out
@@ -0,0 +1,449 @@
+"""
+Append-only binary store for collected pose samples.
+
+Samples are kept in memory until `flush()`, which writes them as one shard
+of .npy files (float32 feature matrix and uint8 label codes, plus the raw
+(33, 4) landmarks and capture timestamps when available) and records the
+shard with its feature width in a small JSON manifest. Training
+memory-maps the shards, which is near-instant and takes a fraction of the
+space of the old pose_samples_*.csv files, and can recompute the features
+from the stored landmarks after a feature change. Existing CSVs can be
+converted once with
+
+    python -m super_mario_motion.sample_store [CSV ...]
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+module_prefix = "[SampleStore]"
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+N_LANDMARKS = 33
+# features are stored as an (n_samples, n_features) matrix
+FEATURE_MATRIX_NDIM = 2
+
+# columns every shard has; landmarks and timestamps are optional
+BASE_COLUMNS = ["features", "labels"]
+LANDMARK_COLUMNS = ["landmarks", "timestamps"]
+
+
+class SampleStore:
+    """Directory of .npy shards plus a manifest listing labels and shards.
+
+    Args:
+        path: Store directory, created on the first flush.
+        run_name: Prefix for the shard names written by this instance,
+            e.g. "<user>_<date>" for one collection run.
+    """
+
+    def __init__(self, path, run_name: str = "run"):
+        self.path = Path(path)
+        self.run_name = run_name
+        self._labels = []
+        self._features = []
+        self._landmarks = []
+        self._timestamps = []
+        self._manifest = self._read_manifest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return sum(shard["count"] for shard in self._manifest["shards"])
+
+    @property
+    def labels(self) -> list[str]:
+        """All labels known to the store, indexed by label code."""
+        return list(self._manifest["labels"])
+
+    @property
+    def shard_names(self) -> list[str]:
+        """Names of the flushed shards, "<run_name>_<index>"."""
+        return [shard["name"] for shard in self._manifest["shards"]]
+
+    @property
+    def pending(self) -> int:
+        """Number of appended samples not yet flushed to disk."""
+        return len(self._labels)
+
+    def append(
+        self, label: str, features: np.ndarray,
+        landmarks: np.ndarray | None = None, timestamp: float | None = None
+        ):
+        """Buffer one sample. Nothing is written before `flush()`.
+
+        Args:
+            label: Pose label of the sample.
+            features: Feature vector computed from the landmarks.
+            landmarks: Optional raw (33, 4) landmark array, stored so the
+                features can be recomputed later.
+            timestamp: Capture time of the landmarks (time.time()),
+                defaults to NaN.
+        """
+        self._labels.append(label)
+        self._features.append(np.asarray(features, dtype=np.float32))
+        if landmarks is not None:
+            self._landmarks.append(np.asarray(landmarks, dtype=np.float32))
+            self._timestamps.append(
+                np.nan if timestamp is None else timestamp
+                )
+
+    def append_many(self, labels, features: np.ndarray):
+        """Buffer a batch of samples given as labels and a 2D matrix."""
+        features = np.asarray(features, dtype=np.float32)
+        if len(labels) != len(features):
+            raise ValueError(
+                f"{module_prefix} got {len(labels)} labels for "
+                f"{len(features)} feature rows"
+                )
+        self._labels.extend(labels)
+        self._features.extend(features)
+
+    def flush(self):
+        """Write all buffered samples as a new shard and update the manifest.
+
+        Returns:
+            str | None: Name of the written shard, None if nothing was
+            buffered.
+        """
+        if not self._labels:
+            return None
+
+        widths = {np.shape(f) for f in self._features}
+        if len(widths) != 1:
+            raise ValueError(
+                f"{module_prefix} got features of different shapes in one "
+                f"shard: {sorted(widths)}"
+                )
+        features = np.stack(self._features).astype(np.float32, copy=False)
+        if features.ndim != FEATURE_MATRIX_NDIM:
+            raise ValueError(
+                f"{module_prefix} expected feature vectors, got features "
+                f"of shape {features.shape}"
+                )
+        with_landmarks = bool(self._landmarks)
+        if with_landmarks and len(self._landmarks) != len(self._labels):
+            raise ValueError(
+                f"{module_prefix} landmarks were given for only "
+                f"{len(self._landmarks)} of {len(self._labels)} samples"
+                )
+        codes = np.array(
+            [self._label_code(label) for label in self._labels],
+            dtype=np.uint8
+            )
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        name = self._next_shard_name()
+        columns = list(BASE_COLUMNS)
+        _save_atomic(self._shard_path(name, "features"), features)
+        _save_atomic(self._shard_path(name, "labels"), codes)
+        if with_landmarks:
+            landmarks = np.stack(self._landmarks)
+            if landmarks.shape[1:] != (N_LANDMARKS, 4):
+                raise ValueError(
+                    f"{module_prefix} expected landmarks of shape (n, "
+                    f"{N_LANDMARKS}, 4), got {landmarks.shape}"
+                    )
+            timestamps = np.array(self._timestamps, dtype=np.float64)
+            _save_atomic(self._shard_path(name, "landmarks"), landmarks)
+            _save_atomic(self._shard_path(name, "timestamps"), timestamps)
+            columns += LANDMARK_COLUMNS
+
+        self._manifest["shards"].append(
+            {
+                "name": name,
+                "count": len(codes),
+                "n_features": features.shape[1],
+                "columns": columns,
+                }
+            )
+        self._write_manifest()
+
+        self._labels = []
+        self._features = []
+        self._landmarks = []
+        self._timestamps = []
+        return name
+
+    def close(self):
+        """Flush remaining samples."""
+        self.flush()
+
+    def load(self, mmap: bool = True, featurize=None):
+        """Load all flushed samples.
+
+        Args:
+            mmap: Memory-map the shards instead of reading them. A store
+                with a single shard is returned without copying.
+            featurize: Optional function mapping an (n, 33, 4) landmark
+                array to an (n, n_features) matrix, e.g.
+                `extract_features_batch`. Shards with stored landmarks get
+                their features recomputed with it; the others keep their
+                stored features and are skipped with a warning if those
+                no longer have the recomputed width.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]:
+                x: Feature matrix of shape (n_samples, n_features), float32.
+                y: Label array of shape (n_samples), dtype str.
+
+        Raises:
+            ValueError: If the shards have different feature widths and
+                cannot be recomputed with `featurize`.
+        """
+        mode = "r" if mmap else None
+        names, feats, codes = [], [], []
+        featurized_width = None
+        for shard in self._manifest["shards"]:
+            name = shard["name"]
+            if featurize is not None and _has_landmarks(shard):
+                landmarks = np.load(
+                    self._shard_path(name, "landmarks"), mmap_mode=mode
+                    )
+                x = np.asarray(featurize(landmarks), dtype=np.float32)
+                featurized_width = x.shape[1]
+            else:
+                x = self._load_features(shard, mode)
+            names.append(name)
+            feats.append(x)
+            codes.append(
+                np.load(self._shard_path(name, "labels"), mmap_mode=mode)
+                )
+
+        if featurized_width is not None:
+            stale = [
+                i for i, x in enumerate(feats)
+                if x.shape[1] != featurized_width
+                ]
+            if stale:
+                print(
+                    f"{module_prefix} WARN: skipping shards without "
+                    f"landmarks whose features are outdated: "
+                    f"{', '.join(names[i] for i in stale)}"
+                    )
+            for i in reversed(stale):
+                del names[i], feats[i], codes[i]
+        widths = {x.shape[1] for x in feats}
+        if len(widths) > 1:
+            raise ValueError(
+                f"{module_prefix} shards have different feature widths: "
+                + ", ".join(
+                    f"{name} ({x.shape[1]})"
+                    for name, x in zip(names, feats, strict=True)
+                    )
+                )
+
+        if not feats:
+            return (
+                np.empty((0, 0), dtype=np.float32),
+                np.empty(0, dtype=str)
+                )
+        x = feats[0] if len(feats) == 1 else np.concatenate(feats)
+        label_names = np.array(self._manifest["labels"])
+        y = label_names[np.concatenate(codes)]
+        return x, y
+
+    def load_landmarks(self, mmap: bool = True):
+        """Load the raw landmarks of all shards that store them.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]:
+                landmarks: Array of shape (n_samples, 33, 4), float32.
+                timestamps: Capture times of shape (n_samples), float64.
+                y: Label array of shape (n_samples), dtype str.
+        """
+        mode = "r" if mmap else None
+        landmarks, timestamps, codes = [], [], []
+        for shard in self._manifest["shards"]:
+            if not _has_landmarks(shard):
+                continue
+            name = shard["name"]
+            landmarks.append(
+                np.load(self._shard_path(name, "landmarks"), mmap_mode=mode)
+                )
+            timestamps.append(
+                np.load(self._shard_path(name, "timestamps"), mmap_mode=mode)
+                )
+            codes.append(
+                np.load(self._shard_path(name, "labels"), mmap_mode=mode)
+                )
+
+        if not landmarks:
+            return (
+                np.empty((0, N_LANDMARKS, 4), dtype=np.float32),
+                np.empty(0, dtype=np.float64),
+                np.empty(0, dtype=str)
+                )
+        label_names = np.array(self._manifest["labels"])
+        return (
+            np.concatenate(landmarks),
+            np.concatenate(timestamps),
+            label_names[np.concatenate(codes)]
+            )
+
+    def _load_features(self, shard: dict, mode) -> np.ndarray:
+        features = np.load(
+            self._shard_path(shard["name"], "features"), mmap_mode=mode
+            )
+        # shards written before the width was recorded are trusted
+        width = shard.get("n_features", features.shape[1])
+        if features.shape[1] != width:
+            raise ValueError(
+                f"{module_prefix} shard {shard['name']} has {width} "
+                f"features in the manifest but {features.shape[1]} on disk"
+                )
+        return features
+
+    def _label_code(self, label: str) -> int:
+        labels = self._manifest["labels"]
+        if label not in labels:
+            labels.append(label)
+        return labels.index(label)
+
+    def _next_shard_name(self) -> str:
+        existing = {shard["name"] for shard in self._manifest["shards"]}
+        i = 0
+        while f"{self.run_name}_{i:03d}" in existing:
+            i += 1
+        return f"{self.run_name}_{i:03d}"
+
+    def _shard_path(self, name: str, column: str) -> Path:
+        return self.path / f"{name}_{column}.npy"
+
+    def _read_manifest(self) -> dict:
+        manifest_path = self.path / MANIFEST_NAME
+        if not manifest_path.exists():
+            return {"version": MANIFEST_VERSION, "labels": [], "shards": []}
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(
+                f"{module_prefix} unsupported manifest version in "
+                f"{manifest_path}: {manifest.get('version')}"
+                )
+        return manifest
+
+    def _write_manifest(self):
+        manifest_path = self.path / MANIFEST_NAME
+        tmp_path = manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._manifest, indent=4))
+        os.replace(tmp_path, manifest_path)
+
+
+def _has_landmarks(shard: dict) -> bool:
+    return "landmarks" in shard.get("columns", BASE_COLUMNS)
+
+
+def _save_atomic(path: Path, arr: np.ndarray):
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, arr)
+    os.replace(tmp_path, path)
+
+
+def read_csv(csv_path):
+    """Read a legacy pose-sample CSV (label, feat_0, ..., feat_N).
+
+    The feature width is taken from the first numeric row; rows that are
+    not numeric (e.g. headers) or have a different width are skipped.
+
+    Returns:
+        tuple[list[str], np.ndarray]: Labels and float32 feature matrix.
+    """
+    labels, rows = [], []
+    n_columns = None
+    with open(csv_path) as f:
+        for line in f:
+            parts = line.strip().split(",")
+            if n_columns is not None and len(parts) != n_columns:
+                continue
+            try:
+                row = np.array(parts[1:], dtype=np.float32)
+            except ValueError:
+                continue
+            if not len(row):
+                continue
+            n_columns = len(parts)
+            rows.append(row)
+            labels.append(parts[0])
+    features = (
+        np.stack(rows) if rows
+        else np.empty((0, 0), dtype=np.float32)
+    )
+    return labels, features
+
+
+def legacy_csvs(data_dir, store: SampleStore | None = None) -> list[Path]:
+    """Return the legacy pose_samples_*.csv run files in `data_dir`.
+
+    Args:
+        data_dir: Folder to search.
+        store: If given, files already converted into this store are left
+            out. `main` names the shards of a file after its stem.
+
+    Returns:
+        list[Path]: Sorted run CSVs, without the combined training file.
+    """
+    converted = set()
+    if store is not None:
+        converted = {name.rsplit("_", 1)[0] for name in store.shard_names}
+    return sorted(
+        p for p in Path(data_dir).glob("pose_samples_*.csv")
+        if p.name != "pose_samples_all.csv" and p.stem not in converted
+        )
+
+
+def convert_csv(csv_path, store: SampleStore) -> int:
+    """Append the samples of a legacy CSV file to `store` as one shard.
+
+    Returns:
+        int: Number of converted samples.
+    """
+    labels, features = read_csv(csv_path)
+    store.append_many(labels, features)
+    store.flush()
+    return len(labels)
+
+
+def main():
+    """Convert legacy pose_samples_*.csv files into a sample store."""
+    from super_mario_motion import user_data
+    from super_mario_motion.state import StateManager
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "csv", nargs="*",
+        help="CSV files to convert (default: all pose_samples_*.csv in "
+             "the data folder)"
+        )
+    ap.add_argument(
+        "--store", default=None,
+        help="store directory (default: <data folder>/samples)"
+        )
+    args = ap.parse_args()
+
+    user_data.init()
+    data_dir = Path(StateManager.get_data_folder_path())
+    store_path = Path(args.store) if args.store else data_dir / "samples"
+    files = [Path(p) for p in args.csv] or legacy_csvs(data_dir)
+    if not files:
+        print(f"{module_prefix} no CSV files to convert in {data_dir}.")
+        return
+
+    for fp in files:
+        store = SampleStore(store_path, run_name=fp.stem)
+        n = convert_csv(fp, store)
+        print(f"{module_prefix} converted {n} samples from {fp.name}")
+    print(f"{module_prefix} store -> {store_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,34 @@
 class Settings:
     # vision
     webcam_fps = 30
+    # capture width requested from the camera, used for the preview
     webcam_res = 640
+    # max width of the frames MediaPipe runs on; lower is faster but less
+    # accurate, independent of the preview
+    inference_res = 640
+    # run MediaPipe only on the player's region of the previous frame,
+    # padded by roi_margin of its size, with a full frame every
+    # roi_redetect_frames frames; read when the camera starts
+    inference_roi = False
+    roi_margin = 0.25
+    roi_redetect_frames = 30
 
     # main
     gui_update_ms = 20
+    # slowest GUI refresh while neither frames nor poses change
+    gui_idle_update_ms = 200
 
     # collect
     collection_fps = 20
 
     # input
     swim_interval = 0.25
+    jump_duration = 0.5
+    swim_tap_duration = 0.05
+    # long enough for emulators that poll the keyboard once per frame
+    throw_tap_duration = 0.1
+    # "pyautogui", "uinput" (Linux, needs evdev) or "recording"
+    input_backend = "pyautogui"
 
     # vision_ml
     ml_majority_vote = 3
@@ -1,22 +1,54 @@
 """Central shared state container for the application.
 
-StateManager stores pose predictions, mode settings, image frames, landmark
-strings and send-permission flags as class-level attributes. GUI, vision,
+StateManager stores pose predictions, mode settings, image frames, landmarks
+and send-permission flags as class-level attributes. GUI, vision,
 vision_ML and input modules all read/write to this manager, providing a simple
 synchronized state interface without requiring instance passing.
+
+Per-frame pose results are additionally published as immutable, versioned
+snapshots, so consumers can block until a new frame arrives instead of
+polling the loose attributes. Likewise, the input loop waits on an input
+version that only changes when a pose, the send permission, the mode or
+the key mapping actually changes.
 """
 
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class PoseSnapshot:
+    """Immutable result of one processed camera frame.
+
+    Attributes:
+        version: Sequence number assigned by StateManager, strictly
+            increasing with every published snapshot.
+        frame_id: Id of the captured camera frame the result belongs to.
+        timestamp: Capture time of the frame (time.perf_counter()).
+        landmarks: Array of shape (33, 4) with [x, y, z, visibility], or
+            None before the first detection.
+        pose: Simple pose label detected on this frame.
+    """
+    version: int = 0
+    frame_id: int = 0
+    timestamp: float = 0.0
+    landmarks: Any = None
+    pose: str = "default"
+
 
 class StateManager:
     # Init default values
     pose = "default"
     pose_full_body = "default"
-
-    landmark_string = "default"
+    # (frame_id, capture timestamp) of the frame that last changed the pose
+    pose_origin = (0, 0.0)
+    pose_full_body_origin = (0, 0.0)
 
     opencv_image_webcam = None
     opencv_image_webcam_skeleton = None
     opencv_image_skeleton_only = None
+    opencv_image_frame_id = 0
     current_cam_index = 0
 
     gui_checkbox_send_permission = False
@@ -27,6 +59,15 @@ class StateManager:
 
     pose_landmarks = None
 
+    snapshot = PoseSnapshot()
+    _snapshot_cond = threading.Condition()
+
+    # bumped whenever a value the input loop reacts to actually changes
+    input_version = 0
+    _input_cond = threading.Condition()
+    # bumped when the control scheme or custom key mapping changes
+    key_mapping_version = 0
+
     standalone = False
 
     data_folder_path = None
@@ -45,8 +86,10 @@ class StateManager:
         return cls.pose_full_body
 
     @classmethod
-    def get_landmark_string(cls):
-        return cls.landmark_string
+    def get_pose_origin(cls, full_body=False):
+        """Return (frame_id, capture timestamp) of the frame that set the
+        current simple or full-body pose."""
+        return cls.pose_full_body_origin if full_body else cls.pose_origin
 
     @classmethod
     def get_all_opencv_images(cls):
@@ -56,6 +99,10 @@ class StateManager:
             cls.opencv_image_skeleton_only,
             )
 
+    @classmethod
+    def get_opencv_image_frame_id(cls):
+        return cls.opencv_image_frame_id
+
     @classmethod
     def get_opencv_image_webcam(cls):
         return cls.opencv_image_webcam
@@ -76,6 +123,70 @@ class StateManager:
     def get_pose_landmarks(cls):
         return cls.pose_landmarks
 
+    @classmethod
+    def get_snapshot(cls):
+        return cls.snapshot
+
+    @classmethod
+    def wait_for_snapshot(cls, after_version, timeout=None):
+        """Block until a snapshot newer than `after_version` is published.
+
+        Args:
+            after_version: Version of the last snapshot the caller has seen.
+            timeout: Maximum time to wait in seconds. None waits forever.
+
+        Returns:
+            PoseSnapshot | None: The newest snapshot, or None on timeout.
+        """
+        with cls._snapshot_cond:
+            if not cls._snapshot_cond.wait_for(
+                    lambda: cls.snapshot.version > after_version, timeout
+                    ):
+                return None
+            return cls.snapshot
+
+    @classmethod
+    def get_input_version(cls):
+        return cls.input_version
+
+    @classmethod
+    def wait_for_input_change(cls, after_version, timeout=None):
+        """Block until a value the input loop reacts to changes.
+
+        These are pose, full-body pose, send permission, mode, control
+        scheme and custom key mapping.
+
+        Args:
+            after_version: Input version the caller has last seen.
+            timeout: Maximum time to wait in seconds. None waits forever.
+
+        Returns:
+            int: The current input version, equal to `after_version` on
+            timeout.
+        """
+        with cls._input_cond:
+            cls._input_cond.wait_for(
+                lambda: cls.input_version != after_version, timeout
+                )
+            return cls.input_version
+
+    @classmethod
+    def get_key_mapping_version(cls):
+        return cls.key_mapping_version
+
+    @classmethod
+    def _set_input_value(cls, name, value, key_mapping=False, origin=None):
+        with cls._input_cond:
+            if getattr(cls, name) == value:
+                return
+            setattr(cls, name, value)
+            if origin is not None:
+                setattr(cls, name + "_origin", origin)
+            if key_mapping:
+                cls.key_mapping_version += 1
+            cls.input_version += 1
+            cls._input_cond.notify_all()
+
     @classmethod
     def get_control_scheme(cls):
         return cls.gui_control_scheme
@@ -102,25 +213,24 @@ class StateManager:
 
     # Setter
     @classmethod
-    def set_pose(cls, new_pose):
-        cls.pose = new_pose
-
-    @classmethod
-    def set_pose_full_body(cls, new_pose):
-        cls.pose_full_body = new_pose
+    def set_pose(cls, new_pose, frame_id=0, timestamp=0.0):
+        cls._set_input_value("pose", new_pose, origin=(frame_id, timestamp))
 
     @classmethod
-    def set_landmark_string(cls, new_landmark_string):
-        cls.landmark_string = new_landmark_string
+    def set_pose_full_body(cls, new_pose, frame_id=0, timestamp=0.0):
+        cls._set_input_value(
+            "pose_full_body", new_pose, origin=(frame_id, timestamp)
+            )
 
     @classmethod
     def set_all_opencv_images(
         cls, new_webcam, new_webcam_skeleton,
-        new_skeleton_only
+        new_skeleton_only, new_frame_id=0
         ):
         cls.opencv_image_webcam = new_webcam
         cls.opencv_image_webcam_skeleton = new_webcam_skeleton
         cls.opencv_image_skeleton_only = new_skeleton_only
+        cls.opencv_image_frame_id = new_frame_id
 
     @classmethod
     def set_current_cam_index(cls, new_cam_index):
@@ -128,23 +238,50 @@ class StateManager:
 
     @classmethod
     def set_send_permission(cls, new_send_permission):
-        cls.gui_checkbox_send_permission = new_send_permission
+        cls._set_input_value(
+            "gui_checkbox_send_permission", new_send_permission
+            )
 
     @classmethod
     def set_current_mode(cls, new_mode):
-        cls.gui_current_mode = new_mode
+        cls._set_input_value("gui_current_mode", new_mode)
 
     @classmethod
     def set_pose_landmarks(cls, new_landmarks):
         cls.pose_landmarks = new_landmarks
 
+    @classmethod
+    def publish_snapshot(cls, landmarks, pose, frame_id=0, timestamp=0.0):
+        """Atomically publish the result of a processed frame.
+
+        Also updates `pose_landmarks` and `pose` so the plain getters stay
+        consistent with the snapshot, then wakes all waiting consumers. A
+        changed pose also wakes the input loop.
+
+        Returns:
+            PoseSnapshot: The published snapshot.
+        """
+        with cls._snapshot_cond:
+            snapshot = PoseSnapshot(
+                version=cls.snapshot.version + 1,
+                frame_id=frame_id,
+                timestamp=timestamp,
+                landmarks=landmarks,
+                pose=pose,
+                )
+            cls.snapshot = snapshot
+            cls.pose_landmarks = landmarks
+            cls.set_pose(pose, frame_id, timestamp)
+            cls._snapshot_cond.notify_all()
+        return snapshot
+
     @classmethod
     def set_standalone(cls, new_standalone):
         cls.standalone = new_standalone
 
     @classmethod
     def set_control_scheme(cls, new_scheme):
-        cls.gui_control_scheme = new_scheme
+        cls._set_input_value("gui_control_scheme", new_scheme, True)
 
     @classmethod
     def set_data_folder_path(cls, new_data_folder_path):
@@ -152,7 +289,7 @@ class StateManager:
 
     @classmethod
     def set_custom_key_mapping(cls, new_mapping):
-        cls.custom_key_mapping = new_mapping
+        cls._set_input_value("custom_key_mapping", new_mapping, True)
 
     @classmethod
     def set_config_path(cls, new_config_path):
@@ -1,9 +1,10 @@
 """
-Train and evaluate the pose classification model from collected CSV data.
+Train and evaluate the pose classification model from collected samples.
 
-Combines multiple run CSVs, loads features/labels, performs a train/test
-split, runs a PCA+SVM pipeline with hyperparameter search, prints metrics,
-and saves the best estimator to disk.
+Memory-maps the binary sample store (or, for old data, combines multiple
+run CSVs), loads features/labels, performs a train/test split, runs a
+PCA+SVM pipeline with hyperparameter search, prints metrics, and saves the
+best estimator to disk.
 """
 
 from pathlib import Path
@@ -17,6 +18,9 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.svm import SVC
 
 from super_mario_motion import user_data
+from super_mario_motion.linear_svm import CompiledLinearSVM
+from super_mario_motion.pose_features import extract_features_batch
+from super_mario_motion.sample_store import SampleStore, legacy_csvs
 from super_mario_motion.settings import Settings
 from super_mario_motion.state import StateManager
 
@@ -28,7 +32,9 @@ user_data.init()
 data_path = state_manager.get_data_folder_path()
 
 CSV_PATH = Path(data_path)
+SAMPLES_PATH = Path(data_path) / "samples"
 MODEL_PATH = Path(data_path) / "pose_model.joblib"
+COMPILED_MODEL_PATH = Path(data_path) / "pose_model.npz"
 NUMBER_OF_ELEMENTS_PER_LINE = 110
 
 
@@ -100,21 +106,39 @@ def main():
     """Train and evaluate a linear SVM classifier.
 
     Steps:
-      * Combine all run CSV files.
-      * Load feature matrix X and labels y.
+      * Load feature matrix X and labels y from the sample store, or
+        combine and load all run CSV files if the store is empty. Run
+        CSVs that were not converted into a non-empty store are reported
+        as skipped.
+        Features of samples with stored raw landmarks are recomputed with
+        the current `extract_features_batch`.
       * Split into train/test sets
       * Set up the pipeline: StandardScaler -> SVC
       * Print classification report and confusion matrix.
-      * Save the model to MODEL_PATH.
+      * Save the model to MODEL_PATH and its compiled NumPy form to
+        COMPILED_MODEL_PATH.
     """
-    # Check if CSV files exist. If so, concatenate them
+    # Check if the data folder exists.
     if not CSV_PATH.exists():
         raise FileNotFoundError(
             f"{CSV_PATH} not found. Collect data first"
             f" with collect.py."
             )
-    training_csv = combine_run_csvs()
-    x, y = load_csv(training_csv)
+    store = SampleStore(SAMPLES_PATH)
+    if len(store) > 0:
+        skipped = legacy_csvs(CSV_PATH, store)
+        if skipped:
+            print(
+                f"WARN: training on the sample store only, skipping "
+                f"{len(skipped)} unconverted run CSVs: "
+                f"{', '.join(p.name for p in skipped)}. Convert them with "
+                f"`python -m super_mario_motion.sample_store` to use them."
+                )
+        x, y = store.load(featurize=extract_features_batch)
+    else:
+        # Legacy data: concatenate the run CSV files
+        training_csv = combine_run_csvs()
+        x, y = load_csv(training_csv)
 
     # drop samples with low average visibilities
     n_vis = 33
@@ -151,6 +175,9 @@ def main():
     dump(pipe, MODEL_PATH)
     print(f"Saved model -> {MODEL_PATH}")
 
+    CompiledLinearSVM.from_pipeline(pipe).save(COMPILED_MODEL_PATH)
+    print(f"Saved compiled model -> {COMPILED_MODEL_PATH}")
+
 
 if __name__ == "__main__":
     main()
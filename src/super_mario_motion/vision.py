@@ -1,39 +1,75 @@
 """
 Webcam and MediaPipe-based pose detection and skeleton rendering.
 
-Captures frames in a background thread, runs MediaPipe Pose, infers a
-simple pose label from landmarks, renders webcam+skeleton frames, and
-stores images, landmarks, pose, and debug strings in the shared
-StateManager.
+Captures frames in a dedicated grabber thread that only keeps the newest
+frame, runs MediaPipe Pose on it in a separate inference thread, infers a
+simple pose label from landmarks and stores landmarks and pose in the
+shared StateManager. The preview image of the selected mode (webcam,
+webcam+skeleton or skeleton only) is rendered by `update_images` on the
+GUI thread, so the inference thread never draws. The landmark debug
+string is likewise only built on demand by `landmark_string`.
+
+Frames in the pipeline are RGB at the native capture resolution, which
+is requested as `Settings.webcam_res` (see `to_canonical`). Every captured
+frame is converted exactly once and then shared without copies between
+preview rendering and the GUI. MediaPipe gets its own copy downscaled to
+`Settings.inference_res` (see `inference_frame`), so the preview quality
+and the inference cost can be tuned independently. With
+`Settings.inference_roi`, MediaPipe only sees a crop around the player
+found in the previous frame, with landmarks mapped back to the full frame.
 """
 
 import math
 import platform
 import threading
 import time
+from contextlib import ExitStack
 from pathlib import Path
+from typing import NamedTuple
 
 import cv2 as cv
 import mediapipe as mp
 import numpy as np
 
+from super_mario_motion import latency
 from super_mario_motion.settings import Settings
 from super_mario_motion.state import StateManager
 
 # globals
-lm_string = None
-skeleton_only_frame = None
 current_pose = "standing"
 
 # runtime
 cam = None
-rgb = None
-frame = None
+# (frame id, RGB frame, landmarks or None) of the last processed frame,
+# replaced as a whole so readers never see a mixed result
+latest_result = (0, None, None)
+# reused canvas for the skeleton previews and the (frame id, mode) drawn
+skeleton_canvas = None
+rendered_preview = None
+# pixel region (x0, y0, x1, y1) around the player for the next inference
+# and the number of frames inferred on it since the last full frame
+roi = None
+roi_frames = 0
+# (snapshot version, string) of the last built landmark debug string
+_landmark_string_cache = (-1, "")
 _exit = False
 _cam_thread = None
+_grab_thread = None
 
 mp_pose = mp.solutions.pose
-mp_drawing = mp.solutions.drawing_utils
+
+# width / height of the capture mode requested from the camera
+CAPTURE_ASPECT = 4 / 3
+
+# skeleton drawing, same colors as mp.solutions.drawing_utils
+CONNECTIONS = np.array(sorted(mp_pose.POSE_CONNECTIONS), dtype=np.intp)
+CONNECTION_COLOR = (224, 224, 224)
+JOINT_COLOR = (0, 0, 255)
+VISIBILITY_THRESHOLD = 0.5
+
+# an ROI needs this many visible landmarks and pixels per side
+MIN_ROI_LANDMARKS = 2
+MIN_ROI_SIZE = 32
 
 state_manager = StateManager()
 
@@ -55,6 +91,14 @@ ankle_left = 27
 ankle_right = 28
 
 
+class Landmark(NamedTuple):
+    """Landmark with the attributes of a MediaPipe landmark."""
+    x: float
+    y: float
+    z: float
+    visibility: float
+
+
 def landmark_coords(image, lm):
     """Return pixel coordinates of a landmark in an image.
 
@@ -70,6 +114,248 @@ def landmark_coords(image, lm):
     return int(w * lm.x), int(h * lm.y)
 
 
+def format_landmark_string(landmarks, width, height):
+    """Format landmarks as pixel coordinates for the debug panel.
+
+    Args:
+        landmarks: Array of shape (33, 4) with normalized [x, y, z,
+            visibility].
+        width: Width of the frame in pixels.
+        height: Height of the frame in pixels.
+
+    Returns:
+        str: "index(x, y)" entries, four per line.
+    """
+    pixels = (
+        np.asarray(landmarks, dtype=np.float64)[:, :2] * (width, height)
+        ).astype(np.int64).tolist()
+    return "".join(
+        f"{i}({x}, {y}) " + ("\n" if (i + 1) % 4 == 0 else "")
+        for i, (x, y) in enumerate(pixels)
+        )
+
+
+def landmark_string():
+    """Return the debug string of the latest published landmarks.
+
+    Built from the current snapshot only when asked for and cached per
+    snapshot version, so the inference thread never pays for it.
+
+    Returns:
+        str: Formatted landmarks, or "" before the first detection.
+    """
+    global _landmark_string_cache
+    snapshot = state_manager.get_snapshot()
+    frame_ = latest_result[1]
+    if snapshot.landmarks is None or frame_ is None:
+        return ""
+    version, text = _landmark_string_cache
+    if version != snapshot.version:
+        h, w = frame_.shape[:2]
+        text = format_landmark_string(snapshot.landmarks, w, h)
+        _landmark_string_cache = (snapshot.version, text)
+    return text
+
+
+def to_canonical(image):
+    """Convert a captured BGR frame into the pipeline's frame format.
+
+    The frame is converted to RGB in place at its native resolution, so
+    no buffer is allocated. The caller must own `image`, which holds for
+    every frame `cam.read()` returns.
+
+    Args:
+        image: BGR frame (H, W, 3) from the camera.
+
+    Returns:
+        np.ndarray: `image`, now in RGB.
+    """
+    return cv.cvtColor(image, cv.COLOR_BGR2RGB, dst=image)
+
+
+def inference_frame(rgb_, width=None):
+    """Return the frame MediaPipe runs on, at most `width` pixels wide.
+
+    Wider frames are downscaled once with INTER_AREA, keeping the aspect
+    ratio so the normalized landmarks also apply to the full frame.
+
+    Args:
+        rgb_: RGB frame at the native capture resolution.
+        width: Maximum width, defaults to `Settings.inference_res`.
+
+    Returns:
+        np.ndarray: Downscaled frame, or `rgb_` itself if it is narrow
+        enough.
+    """
+    width = width or Settings.inference_res
+    h, w = rgb_.shape[:2]
+    if w <= width:
+        return rgb_
+    scale = width / float(w)
+    return cv.resize(
+        rgb_, (width, int(h * scale)), interpolation=cv.INTER_AREA
+        )
+
+
+def landmark_roi(landmarks, width, height, margin=None):
+    """Return the pixel region around the visible landmarks.
+
+    Args:
+        landmarks: Array of shape (33, 4) with normalized [x, y, z,
+            visibility].
+        width: Frame width in pixels.
+        height: Frame height in pixels.
+        margin: Added on every side, as a fraction of the larger side of
+            the bounding box. Defaults to `Settings.roi_margin`.
+
+    Returns:
+        tuple[int, int, int, int] | None: (x0, y0, x1, y1) clipped to the
+        frame, or None if too few landmarks are visible or the region
+        is smaller than MIN_ROI_SIZE.
+    """
+    if margin is None:
+        margin = Settings.roi_margin
+    visible = landmarks[landmarks[:, 3] >= VISIBILITY_THRESHOLD, :2]
+    if len(visible) < MIN_ROI_LANDMARKS:
+        return None
+    x_min, y_min = visible.min(axis=0) * (width, height)
+    x_max, y_max = visible.max(axis=0) * (width, height)
+    pad = margin * max(x_max - x_min, y_max - y_min)
+    region = (
+        max(0, int(x_min - pad)), max(0, int(y_min - pad)),
+        min(width, math.ceil(x_max + pad)), min(height, math.ceil(y_max + pad))
+        )
+    if (region[2] - region[0] < MIN_ROI_SIZE
+            or region[3] - region[1] < MIN_ROI_SIZE):
+        return None
+    return region
+
+
+def region_to_frame(landmarks, region, width, height):
+    """Map landmarks normalized to `region` into full-frame coordinates.
+
+    Args:
+        landmarks: Array of shape (33, 4) detected on the region crop.
+        region: Pixel region (x0, y0, x1, y1) the landmarks belong to.
+        width: Full frame width in pixels.
+        height: Full frame height in pixels.
+
+    Returns:
+        np.ndarray: New array normalized to the full frame. z scales like
+        x, as MediaPipe normalizes it by the image width.
+    """
+    x0, y0, x1, y1 = region
+    scale_x = (x1 - x0) / width
+    mapped = landmarks.copy()
+    mapped[:, 0] = landmarks[:, 0] * scale_x + x0 / width
+    mapped[:, 1] = landmarks[:, 1] * ((y1 - y0) / height) + y0 / height
+    mapped[:, 2] = landmarks[:, 2] * scale_x
+    return mapped
+
+
+def inference_region(width, height):
+    """Return the pixel region of the next frame to run MediaPipe on.
+
+    The full frame, unless `Settings.inference_roi` is set and the player
+    was found in the previous frame. Every `Settings.roi_redetect_frames`
+    frames the full frame is used again, so a second player or a player
+    who left the crop is picked up.
+    """
+    global roi_frames
+    if (not Settings.inference_roi or roi is None
+            or roi_frames >= Settings.roi_redetect_frames):
+        roi_frames = 0
+        return 0, 0, width, height
+    roi_frames += 1
+    return roi
+
+
+def create_full_frame_pose():
+    """Create the MediaPipe model for full frames.
+
+    In ROI mode, full frames are only seen every
+    `Settings.roi_redetect_frames` frames or while the player is lost, so
+    they are detected from scratch instead of tracked across frames.
+    """
+    if Settings.inference_roi:
+        return mp_pose.Pose(static_image_mode=True)
+    return mp_pose.Pose()
+
+
+def create_roi_pose():
+    """Create the MediaPipe model for ROI crops.
+
+    Kept apart from the full-frame model, since tracking and smoothing
+    work in the normalized coordinates of the previous input. The crop
+    changes every frame, so its landmarks are not smoothed.
+    """
+    return mp_pose.Pose(smooth_landmarks=False)
+
+
+def update_roi(landmarks, width, height):
+    """Track the player region from full-frame landmarks (or None)."""
+    global roi
+    if landmarks is None or not Settings.inference_roi:
+        roi = None
+    else:
+        roi = landmark_roi(landmarks, width, height)
+
+
+class LatestFrame:
+    """Single-slot buffer holding only the newest captured frame.
+
+    The grabber thread overwrites the slot with every new frame; frames that
+    were never consumed are dropped and counted in `dropped`. The inference
+    thread always takes the freshest frame, so a slow MediaPipe frame never
+    lets stale frames pile up.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self._frame_id = 0
+        self._timestamp = 0.0
+        self.dropped = 0
+
+    def put(self, frame_, timestamp):
+        """Store a new frame, replacing (and counting) an unconsumed one."""
+        with self._cond:
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = frame_
+            self._frame_id += 1
+            self._timestamp = timestamp
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Take the newest frame out of the slot.
+
+        Args:
+            timeout: Maximum time in seconds to wait for a frame. None waits
+                indefinitely.
+
+        Returns:
+            tuple[int, float, np.ndarray] | None: (frame_id, capture
+            timestamp, frame), or None if no frame arrived in time.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                    lambda: self._frame is not None, timeout
+                    ):
+                return None
+            frame_ = self._frame
+            self._frame = None
+            return self._frame_id, self._timestamp, frame_
+
+    def clear(self):
+        """Drop a pending frame without counting it."""
+        with self._cond:
+            self._frame = None
+
+
+latest_frame = LatestFrame()
+
+
 def init():
     """Initialize the webcam and start the camera processing thread.
 
@@ -78,18 +364,18 @@ def init():
     until the user grants access. To provide a better UX, we retry opening the
     camera for a short period instead of failing immediately.
 
-    Starts `cam_loop` as a daemon thread once the camera is available.
-    Raises an IOError only after a generous timeout.
+    Starts `grab_loop` and `cam_loop` as daemon threads once the camera is
+    available. Raises an IOError only after a generous timeout.
     """
-    global cam, rgb, frame, _cam_thread, _exit
+    global cam, _cam_thread, _grab_thread, _exit
 
     is_macos = platform.system() == "Darwin"
     timeout_s = 30 if is_macos else 8
     start = time.time()
 
-    if _cam_thread is not None and _cam_thread.is_alive():
+    if _threads_alive():
         stop_cam()
-        if _cam_thread is not None and _cam_thread.is_alive():
+        if _threads_alive():
             return
     _exit = False
 
@@ -116,19 +402,30 @@ def init():
         time.sleep(0.5)
 
     print("cam opened")
+    latest_frame.clear()
+    _grab_thread = threading.Thread(target=grab_loop, daemon=True)
+    _grab_thread.start()
     _cam_thread = threading.Thread(target=cam_loop, daemon=True)
     _cam_thread.start()
 
 
+def _threads_alive():
+    return any(
+        t is not None and t.is_alive() for t in (_grab_thread, _cam_thread)
+        )
+
+
 def stop_cam():
-    global _exit, _cam_thread, cam
+    global _exit, _cam_thread, _grab_thread, cam
     _exit = True
 
-    if _cam_thread is not None:
-        _cam_thread.join(timeout=2.0)
-        if _cam_thread.is_alive():
-            return
+    for t in (_grab_thread, _cam_thread):
+        if t is not None:
+            t.join(timeout=2.0)
+    if _threads_alive():
+        return
 
+    _grab_thread = None
     _cam_thread = None
 
     if cam is not None:
@@ -236,121 +533,248 @@ def detect_pose_simple(frame_, lm):
     return "standing"
 
 
-def cam_loop():
-    """Camera processing loop that runs in a background thread.
+def configure_camera(camera):
+    """Request the capture mode from an opened camera.
+
+    Sets FPS, frame width and height and a short driver queue. Width and
+    height are always set together, since several backends (MSMF,
+    DirectShow) ignore or mismatch a width without a height. Backends may
+    still pick the closest mode they support.
+
+    Args:
+        camera: Opened cv.VideoCapture.
+    """
+    width = Settings.webcam_res
+    properties = [
+        (cv.CAP_PROP_FPS, Settings.webcam_fps),
+        # the native frame is the preview, MediaPipe gets a downscaled one
+        (cv.CAP_PROP_FRAME_WIDTH, width),
+        (cv.CAP_PROP_FRAME_HEIGHT, round(width / CAPTURE_ASPECT)),
+        # keep the driver queue short, stale frames are dropped here anyway
+        (cv.CAP_PROP_BUFFERSIZE, 1),
+        ]
+    for prop, value in properties:
+        try:
+            camera.set(prop, value)
+        except Exception:
+            pass
+
+
+def grab_loop():
+    """Frame grabber loop that runs in a background thread.
 
     This loop:
       * Continuously tries to (re)open the webcam if needed.
-      * Grabs frames from the webcam.
-      * Runs MediaPipe Pose on each frame.
-      * Draws skeleton overlays for full and skeleton-only frames.
-      * Extracts pose landmarks as a NumPy array.
-      * Detects the current simple pose via `detect_pose_simple`.
-      * Updates the StateManager with landmarks, pose and debug strings.
+      * Grabs frames from the webcam as fast as the driver delivers them.
+      * Publishes each frame into the single-slot `latest_frame` buffer,
+        replacing any frame the inference thread has not consumed yet.
 
     The loop tolerates temporary failures (e.g., while the user grants
     permissions on macOS) by retrying instead of exiting immediately.
     """
-    global frame, rgb, cam, current_pose, skeleton_only_frame, lm_string
+    global cam
 
-    with mp_pose.Pose() as pose:
-        print(Path(__file__).name + " initialized")
+    if cam is None or not cam.isOpened():
+        cam = None
+        return
+    configure_camera(cam)
 
-        if cam is None or not cam.isOpened():
-            cam = None
-            return
+    while not _exit:
+        # Ensure the camera handle is open; try to (re)open if needed
         try:
-            cam.set(cv.CAP_PROP_FPS, Settings.webcam_fps)
+            opened = cam.isOpened() if cam is not None else False
         except Exception:
-            pass
-
-        while not _exit:
-            # Ensure the camera handle is open; try to (re)open if needed
+            opened = False
+        if not opened:
             try:
-                opened = cam.isOpened() if cam is not None else False
+                if cam is not None:
+                    cam.release()
             except Exception:
-                opened = False
-            if not opened:
-                try:
-                    if cam is not None:
-                        cam.release()
-                except Exception:
-                    pass
-                cam = cv.VideoCapture(state_manager.get_current_cam_index())
-                time.sleep(0.2)
-
-                try:
-                    if not cam.isOpened():
-                        cam = None
-                        time.sleep(0.5)
-                        continue
-                except Exception:
+                pass
+            cam = cv.VideoCapture(state_manager.get_current_cam_index())
+            time.sleep(0.2)
+
+            try:
+                if not cam.isOpened():
                     cam = None
                     time.sleep(0.5)
                     continue
-
-            if cam is None:
-                time.sleep(0.05)
+            except Exception:
+                cam = None
+                time.sleep(0.5)
                 continue
-            ret, image = cam.read()
+            configure_camera(cam)
 
-            if not ret or image is None:
-                time.sleep(0.05)
-                continue
+        if cam is None:
+            time.sleep(0.05)
+            continue
+        ret, image = cam.read()
 
-            h, w = image.shape[:2]
-            scale = Settings.webcam_res / float(w)
-            new_h = int(h * scale)
-            image = cv.resize(image, (Settings.webcam_res, new_h))
+        if not ret or image is None:
+            time.sleep(0.05)
+            continue
 
-            rgb = cv.cvtColor(image, cv.COLOR_BGR2RGB)
-            results = pose.process(rgb)
-            frame = cv.cvtColor(image, cv.COLOR_RGB2BGR)
+        latest_frame.put(image, time.perf_counter())
 
-            if results.pose_landmarks:
-                # Draw webcam footage and skeleton
-                mp_drawing.draw_landmarks(
-                    frame, results.pose_landmarks, mp_pose.POSE_CONNECTIONS
-                    )
+    try:
+        if cam is not None:
+            cam.release()
+    finally:
+        cam = None
 
-                # Draw an image of only the skeleton
-                skeleton_only_frame = np.zeros_like(frame)
-                mp_drawing.draw_landmarks(
-                    skeleton_only_frame, results.pose_landmarks,
-                    mp_pose.POSE_CONNECTIONS
-                    )
 
+def cam_loop():
+    """Pose inference loop that runs in a background thread.
+
+    This loop:
+      * Takes the freshest frame from the `latest_frame` buffer.
+      * Converts it to RGB and runs MediaPipe Pose on a copy downscaled
+        to `Settings.inference_res`, cropped to the player's region in
+        ROI mode. Crops use their own model (see `create_roi_pose`).
+      * Extracts pose landmarks as a NumPy array.
+      * Detects the current simple pose via `detect_pose_simple`.
+      * Publishes landmarks and pose as a snapshot in the StateManager,
+        tagged with the frame id and capture time.
+      * Hands the frame and its landmarks to `update_images` via
+        `latest_result`.
+      * Records the per-stage durations in `latency`.
+    """
+    global current_pose, latest_result
+
+    with ExitStack() as models:
+        pose = models.enter_context(create_full_frame_pose())
+        roi_pose = None
+        print(Path(__file__).name + " initialized")
+
+        while not _exit:
+            item = latest_frame.get(timeout=0.1)
+            if item is None:
+                continue
+            frame_id, captured_at, image = item
+            started_at = time.perf_counter()
+            latency.record("queue_wait", started_at - captured_at)
+
+            rgb = to_canonical(image)
+            h, w = rgb.shape[:2]
+            region = inference_region(w, h)
+            x0, y0, x1, y1 = region
+            model = pose
+            if region != (0, 0, w, h):
+                if roi_pose is None:
+                    roi_pose = models.enter_context(create_roi_pose())
+                model = roi_pose
+            results = model.process(
+                np.ascontiguousarray(inference_frame(rgb[y0:y1, x0:x1]))
+                )
+            latency.record("pose_inference", time.perf_counter() - started_at)
+
+            lm_arr = None
+            if results.pose_landmarks:
                 # Simple pose detection
                 lm = results.pose_landmarks.landmark
 
-                # save landmarks to the state
                 lm_arr = np.array(
                     [[p.x, p.y, p.z, p.visibility] for p in lm],
                     dtype=np.float32
                     )
-                state_manager.set_pose_landmarks(lm_arr)
+                if region != (0, 0, w, h):
+                    lm_arr = region_to_frame(lm_arr, region, w, h)
+                    lm = [Landmark(*p) for p in lm_arr.tolist()]
 
                 # get current pose via helper method
-                current_pose = detect_pose_simple(frame, lm)
+                classify_start = time.perf_counter()
+                current_pose = detect_pose_simple(rgb, lm)
+                latency.record(
+                    "classify_simple", time.perf_counter() - classify_start
+                    )
 
-                state_manager.set_pose(current_pose)
+                # publish landmarks and pose as one versioned snapshot
+                state_manager.publish_snapshot(
+                    lm_arr, current_pose, frame_id, captured_at
+                    )
+                latency.record(
+                    "capture_to_snapshot", time.perf_counter() - captured_at
+                    )
 
-                # Saves all Landmark cords into a string
-                lm_string = ""
-                for x in range(33):
-                    lm_string += str(x) + str(
-                        landmark_coords(frame, lm[x])
-                        ) + " "
-                    if (x + 1) % 4 == 0:
-                        lm_string += "\n"
-                state_manager.set_landmark_string(lm_string)
+            update_roi(lm_arr, w, h)
+            latest_result = (frame_id, rgb, lm_arr)
 
-    try:
-        if cam is not None:
-            cam.release()
-    finally:
-        cam = None
+
+def draw_skeleton(canvas, landmarks):
+    """Draw the pose skeleton onto `canvas` in place.
+
+    All bones and all joints are drawn with one `cv.polylines` call each;
+    joints are zero-length lines whose round caps form the dots. Like
+    MediaPipe, landmarks below `VISIBILITY_THRESHOLD` are left out.
+
+    Args:
+        canvas: Image (H, W, 3) to draw on.
+        landmarks: Array of shape (33, 4) with normalized [x, y, z,
+            visibility].
+
+    Returns:
+        np.ndarray: `canvas`.
+    """
+    h, w = canvas.shape[:2]
+    points = np.rint(landmarks[:, :2] * (w, h)).astype(np.int32)
+    visible = landmarks[:, 3] >= VISIBILITY_THRESHOLD
+
+    bones = CONNECTIONS[visible[CONNECTIONS].all(axis=1)]
+    if len(bones):
+        cv.polylines(canvas, points[bones], False, CONNECTION_COLOR, 2)
+    joints = points[visible]
+    if len(joints):
+        cv.polylines(
+            canvas, np.repeat(joints[:, None], 2, axis=1), False,
+            JOINT_COLOR, 6
+            )
+    return canvas
 
 
-def update_images():
-    state_manager.set_all_opencv_images(rgb, frame, skeleton_only_frame)
+def render_preview(mode, rgb_, landmarks):
+    """Return the preview image of `mode` for a frame.
+
+    "Webcam" returns the frame itself; the skeleton modes draw into the
+    reused `skeleton_canvas`, which is only valid until the next call.
+
+    Args:
+        mode: Preview mode selected in the GUI.
+        rgb_: RGB camera frame.
+        landmarks: Landmarks of the frame, or None if no body was found.
+
+    Returns:
+        np.ndarray: RGB preview image.
+    """
+    global skeleton_canvas
+    if mode not in ("Webcam + Skeleton", "Skeleton Only"):
+        return rgb_
+    if skeleton_canvas is None or skeleton_canvas.shape != rgb_.shape:
+        skeleton_canvas = np.empty_like(rgb_)
+    if mode == "Skeleton Only":
+        skeleton_canvas.fill(0)
+    else:
+        np.copyto(skeleton_canvas, rgb_)
+    if landmarks is not None:
+        draw_skeleton(skeleton_canvas, landmarks)
+    return skeleton_canvas
+
+
+def update_images(preview_mode="Webcam"):
+    """Render the newest frame in `preview_mode` into the StateManager.
+
+    Called from the GUI update loop; does nothing if neither the frame nor
+    the mode changed since the last call. Only the image of the selected
+    mode is set, the other preview slots are None.
+    """
+    global rendered_preview
+    frame_id, rgb_, landmarks = latest_result
+    if rgb_ is None or rendered_preview == (frame_id, preview_mode):
+        return
+    rendered_preview = (frame_id, preview_mode)
+    image = render_preview(preview_mode, rgb_, landmarks)
+    state_manager.set_all_opencv_images(
+        rgb_,
+        image if preview_mode == "Webcam + Skeleton" else None,
+        image if preview_mode == "Skeleton Only" else None,
+        frame_id
+        )
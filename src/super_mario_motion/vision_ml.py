@@ -2,10 +2,12 @@
 Full-body pose classification from MediaPipe landmarks using a trained ML
 model.
 
-Loads an SVM-based pose classifier (external or bundled), runs a passive
-background worker that reads pose landmarks from StateManager, extracts
-features, predicts poses with smoothing, and writes the smoothed full-body
-pose labels back to shared state.
+Loads an SVM-based pose classifier (external or bundled, compiled to a
+pure-NumPy evaluation where possible), runs a passive
+background worker that wakes up whenever vision publishes new pose
+landmarks to StateManager, extracts features, predicts poses with
+smoothing, and writes the smoothed full-body pose labels back to shared
+state.
 """
 
 import os
@@ -14,13 +16,15 @@ import time
 from collections import deque
 from pathlib import Path
 from pickle import UnpicklingError
+from zipfile import BadZipFile
 
 import numpy as np
 from joblib import load
 from sklearn.exceptions import NotFittedError
 
-from super_mario_motion import path_helper as ph
-from super_mario_motion.pose_features import extract_features
+from super_mario_motion import latency, path_helper as ph
+from super_mario_motion.linear_svm import CompiledLinearSVM, compile_model
+from super_mario_motion.pose_features import FeatureExtractor
 from super_mario_motion.settings import Settings
 # get frames from vision.py
 from super_mario_motion.state import StateManager
@@ -35,6 +39,13 @@ model_path = None
 
 P_THRESH = Settings.p_thresh  # threshold for model confidence
 VOTE_RATIO = Settings.vote_ratio  # ratio for the majority vote
+WAIT_TIMEOUT = 0.1  # seconds, bounds the reaction time to stop()
+
+stats = {
+    "frames_classified": 0,
+    "frames_skipped_low_visibility": 0,
+    "idle_time": 0.0,
+    }
 
 
 def init():
@@ -42,21 +53,28 @@ def init():
     global _thread, _exit, _model, model_path
     _exit = False
 
-    # Try to load the external model
+    # Try to load the external model, preferring the compiled format
     try:
-        model_path = Path(
-            state_manager.get_data_folder_path()
-            ) / "pose_model.joblib"
-        _model = load(model_path)
+        data_folder = Path(state_manager.get_data_folder_path())
+        model_path = data_folder / "pose_model.joblib"
+        compiled_path = data_folder / "pose_model.npz"
+        if _is_current(compiled_path, model_path):
+            model_path = compiled_path
+            _model = CompiledLinearSVM.load(model_path)
+        else:
+            _model = compile_model(load(model_path))
         print(f"[vision_ml] external model loaded ({model_path})")
-    except (FileNotFoundError, OSError, EOFError, UnpicklingError):
+    except (
+            FileNotFoundError, OSError, EOFError, UnpicklingError,
+            ValueError, KeyError, BadZipFile
+            ):
         print(f"[vision_ml] could not load external model at: {model_path}")
         # Try to load the internal fallback model
         try:
             model_path = ph.resource_path(
                 os.path.join("data", "pose_model.joblib")
                 )
-            _model = load(model_path)
+            _model = compile_model(load(model_path))
             print(f"[vision_ml] fallback model loaded ({model_path})")
         except Exception as e:
             _model = None
@@ -66,51 +84,74 @@ def init():
     _thread.start()
 
 
+def _is_current(compiled_path, model_path):
+    """Return True if the compiled model exists and is not older than the
+    joblib model next to it."""
+    if not compiled_path.exists():
+        return False
+    if not model_path.exists():
+        return True
+    return compiled_path.stat().st_mtime >= model_path.stat().st_mtime
+
+
 def _worker():
-    """Continuously classify full-body poses from landmark data.
+    """Classify full-body poses whenever vision publishes new landmarks.
 
     Steps:
-      * Read the latest landmarks from StateManager.
-      * Extract PCA-scaled feature vector.
+      * Block until StateManager publishes a new pose snapshot.
+      * Extract the feature vector into a preallocated buffer.
       * Predict pose with the loaded SVM model.
       * Apply the majority vote smoothing over recent predictions.
-      * Store smoothed pose in StateManager.
+      * Store smoothed pose in StateManager, tagged with the frame id and
+        capture time of the snapshot.
+      * Record the classification latency in `latency`.
 
-    Runs until `_exit` is set to True.
+    Every snapshot is classified at most once, and snapshots published
+    before the worker started are ignored. Runs until `_exit` is set to
+    True.
     """
     global _current_pose, _exit
 
     print(Path(__file__).name + " initialized (passive)")
 
     smooth = deque(maxlen=Settings.ml_majority_vote)
+    extractor = FeatureExtractor()
+    # only classify snapshots published after a (re)start
+    last_version = state_manager.get_snapshot().version
 
     while not _exit:
-        lm_arr = state_manager.get_pose_landmarks()
+        idle_start = time.perf_counter()
+        snapshot = state_manager.wait_for_snapshot(
+            last_version, timeout=WAIT_TIMEOUT
+            )
+        stats["idle_time"] += time.perf_counter() - idle_start
+
+        if snapshot is None:
+            continue
+        last_version = snapshot.version
 
+        lm_arr = snapshot.landmarks
         if lm_arr is None:
-            time.sleep(0.01)
             continue
 
         # skip frames with low landmark visibility
         vis = lm_arr[:, 3]
         if np.mean(vis) < Settings.frame_quality:  # can be tuned later
-            time.sleep(0.01)
+            stats["frames_skipped_low_visibility"] += 1
             continue
 
+        classify_start = time.perf_counter()
         try:
-            feat = extract_features(lm_arr)
+            feat = extractor.extract(lm_arr)
         except (ValueError, TypeError):
-            time.sleep(0.01)
             continue
 
         if feat is None:
-            time.sleep(0.01)
             continue
 
         try:
             x = feat.reshape(1, -1)
         except ValueError:
-            time.sleep(0.01)
             continue
 
         label = None
@@ -124,6 +165,7 @@ def _worker():
                     label = None
             except (ValueError, TypeError, NotFittedError):
                 label = None
+        stats["frames_classified"] += 1
 
         if label is not None:
             smooth.append(label)
@@ -134,9 +176,23 @@ def _worker():
 
             if best_ratio >= VOTE_RATIO:
                 _current_pose = best_label
-                state_manager.set_pose_full_body(_current_pose)
+                state_manager.set_pose_full_body(
+                    _current_pose, snapshot.frame_id, snapshot.timestamp
+                    )
 
-        time.sleep(0.001)
+        now = time.perf_counter()
+        latency.record("ml_classify", now - classify_start)
+        latency.record_since("capture_to_ml_pose", snapshot.timestamp, now)
+
+
+def get_stats():
+    """Return a copy of the worker statistics.
+
+    Returns:
+        dict: frames_classified, frames_skipped_low_visibility and
+        idle_time (seconds spent waiting for new landmarks).
+    """
+    return dict(stats)
 
 
 def stop():
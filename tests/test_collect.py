@@ -0,0 +1,95 @@
+"""
+Tests for recording pose samples from the app's published landmarks.
+
+Publishes snapshots from a thread and verifies that every frame is stored
+once with its raw landmarks, without running MediaPipe, and that the
+long-lived Collector flushes one shard per step and can be stopped.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from super_mario_motion import collect
+from super_mario_motion.pose_features import extract_features
+from super_mario_motion.sample_store import SampleStore
+from super_mario_motion.state import StateManager
+
+# frames 101, 102 and 103, with 102 published twice
+N_UNIQUE_FRAMES = 3
+MAX_TIMESTAMP_AGE_S = 5.0
+# one "walking" and one "ducking" step
+N_STEPS = 2
+
+
+def publish_frames(frame_ids, interval=0.02):
+    rng = np.random.default_rng(0)
+    for frame_id in frame_ids:
+        time.sleep(interval)
+        lm = rng.random((33, 4)).astype(np.float32)
+        StateManager.publish_snapshot(
+            lm, "standing", frame_id, time.perf_counter()
+            )
+
+
+def test_record_landmarks_saves_each_frame_once(tmp_path):
+    # frame 102 is published twice, e.g. once per consumer update
+    publisher = threading.Thread(
+        target=publish_frames, args=([101, 102, 102, 103],), daemon=True
+        )
+    store = SampleStore(tmp_path)
+    publisher.start()
+
+    n_saved = collect.record_landmarks(store, "walking", 0.3, fps=1000)
+    publisher.join()
+    store.flush()
+
+    landmarks, timestamps, y = store.load_landmarks()
+    assert n_saved == N_UNIQUE_FRAMES
+    assert list(y) == ["walking"] * N_UNIQUE_FRAMES
+    assert np.all(np.diff(timestamps) > 0)
+    assert abs(timestamps[-1] - time.time()) < MAX_TIMESTAMP_AGE_S
+    x, _ = store.load()
+    np.testing.assert_array_equal(x[0], extract_features(landmarks[0]))
+
+
+def test_record_landmarks_ignores_missing_landmarks(tmp_path):
+    publisher = threading.Timer(
+        0.02, StateManager.publish_snapshot, args=(None, "default", 9)
+        )
+    store = SampleStore(tmp_path)
+    publisher.start()
+
+    n_saved = collect.record_landmarks(store, "walking", 0.1, fps=1000)
+
+    assert n_saved == 0
+    assert store.pending == 0
+
+
+def test_collector_flushes_one_shard_per_step(tmp_path):
+    with collect.Collector(tmp_path, run_name="run") as collector:
+        for label, frame_ids in (("walking", [201, 202]), ("ducking", [203])):
+            publisher = threading.Thread(
+                target=publish_frames, args=(frame_ids,), daemon=True
+                )
+            publisher.start()
+            collector.record(label, 0.15)
+            publisher.join()
+            assert collector.store.pending == 0
+
+    store = SampleStore(tmp_path)
+    _, y = store.load()
+    assert list(y) == ["walking", "walking", "ducking"]
+    assert len(store._manifest["shards"]) == N_STEPS
+
+
+def test_collector_stop_ends_record_early(tmp_path):
+    collector = collect.Collector(tmp_path)
+    threading.Timer(0.05, collector.stop).start()
+
+    t_start = time.time()
+    collector.record("walking", 5.0)
+    collector.close()
+
+    assert time.time() - t_start < 1.0
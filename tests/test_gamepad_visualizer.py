@@ -70,3 +70,29 @@ def test_draw_highlight_overlay():
     # the image should be different because an input is being sent and
     # highlighted
     assert not images_equal(res_image2, expected)
+
+
+def test_gamepad_frames_are_cached_per_button_set(monkeypatch):
+    monkeypatch.setattr(gv, "frame_cache", {})
+    pressed = gv.pressed_buttons("running_right")
+
+    frame = gv.get_gamepad_frame(pressed, (200, 100))
+
+    assert pressed == frozenset({"DPAD_RIGHT", "B"})
+    assert frame.size == (200, 100)
+    assert gv.get_gamepad_frame(frozenset({"B", "DPAD_RIGHT"}), (200, 100)) \
+        is frame
+    assert gv.get_gamepad_frame(frozenset(), (200, 100)) is not frame
+
+
+def test_create_gamepad_image_matches_uncached_rendering(monkeypatch):
+    monkeypatch.setattr(gv, "frame_cache", {})
+    expected = gv.compose_gamepad_image(
+        get_base_image(), ["B", "DPAD_LEFT"]
+        )
+
+    image = gv.create_gamepad_image("running_left")
+
+    assert images_equal(image, expected)
+    assert gv.pressed_buttons("running_left", send_active=False) == \
+        frozenset()
@@ -0,0 +1,154 @@
+"""
+Tests for the Tk-independent preview helpers of the GUI.
+
+Verifies the cached letterbox layout, that rendering into a reused
+canvas mirrors the image and leaves the black bars untouched, and that
+pose icons and gamepad frames are created once and only shown again when
+the pose or the pressed buttons change. Also checks that stopping a
+collection tolerates the record thread dropping the collector.
+"""
+
+import numpy as np
+import pytest
+
+from super_mario_motion import gui
+
+WHITE = 255
+BACKGROUND = 7
+# standing, jumping, then the unknown icon for the invalid "dabbing"
+N_POSE_ICON_CHANGES = 3
+# {"A"} and the empty set, shown as A, nothing, A
+N_GAMEPAD_PHOTOS = 2
+N_GAMEPAD_CHANGES = 3
+
+
+def test_letterbox_layout_keeps_aspect_ratio():
+    assert gui.letterbox_layout(640, 480, 612, 408) == (544, 408, 34, 0)
+    assert gui.letterbox_layout(1280, 480, 612, 408) == (612, 229, 0, 89)
+    assert (640, 480, 612, 408) in gui.preview_layouts
+
+
+def test_render_letterbox_mirrors_into_canvas():
+    array = np.zeros((40, 60, 3), dtype=np.uint8)
+    array[:, :30] = WHITE  # left half white
+    layout = gui.letterbox_layout(60, 40, 90, 40)
+    canvas = np.full((40, 90, 3), BACKGROUND, dtype=np.uint8)
+
+    gui.render_letterbox(array, layout, canvas)
+
+    new_w, new_h, x0, y0 = layout
+    assert (new_w, new_h, x0, y0) == (60, 40, 15, 0)
+    assert np.all(canvas[:, :x0] == BACKGROUND)
+    assert np.all(canvas[:, x0 + new_w:] == BACKGROUND)
+    # mirrored: the white half is now on the right
+    assert np.all(canvas[:, x0 + 30:x0 + new_w] == WHITE)
+    assert np.all(canvas[:, x0:x0 + 30] == 0)
+
+
+class FakeLabel:
+    def __init__(self):
+        self.configured = []
+
+    def config(self, **kwargs):
+        self.configured.append(kwargs)
+
+
+def test_pose_image_is_cached_and_only_set_on_change(monkeypatch):
+    opened = []
+    monkeypatch.setattr(
+        gui.ImageTk, "PhotoImage", lambda img: ("photo", img.size)
+        )
+    real_open = gui.Image.open
+    monkeypatch.setattr(
+        gui.Image, "open", lambda path: opened.append(path) or real_open(path)
+        )
+    monkeypatch.setattr(gui, "pose_images", {})
+    monkeypatch.setattr(gui, "shown_pose_image", None)
+    monkeypatch.setattr(gui, "window", type("Window", (), {})())
+    label = FakeLabel()
+    monkeypatch.setattr(gui, "label_pose_visualizer", label)
+
+    for pose in ["standing", "standing", "jumping", "dabbing", "dabbing"]:
+        gui.update_pose(pose)
+        gui.update_pose_image()
+
+    assert len(opened) == len(gui.VALID_POSES) + 1
+    assert len(label.configured) == N_POSE_ICON_CHANGES
+    assert gui.shown_pose_image == gui.UNKNOWN_POSE
+    assert label.image == ("photo", gui.pose_image_size)
+
+
+def test_gamepad_photo_is_reused_per_button_set(monkeypatch):
+    created = []
+    monkeypatch.setattr(
+        gui.ImageTk, "PhotoImage", lambda img: created.append(img) or img
+        )
+    monkeypatch.setattr(gui, "gamepad_photos", {})
+    monkeypatch.setattr(gui, "shown_gamepad_buttons", None)
+    label = FakeLabel()
+    monkeypatch.setattr(gui, "label_virtual_gamepad_visualizer", label)
+
+    for buttons in [{"A"}, {"A"}, set(), {"A"}]:
+        gui.set_gamepad_buttons(frozenset(buttons))
+
+    assert len(created) == N_GAMEPAD_PHOTOS
+    assert len(label.configured) == N_GAMEPAD_CHANGES
+    assert label.image.size == (
+        gui.gamepad_image_width, gui.gamepad_image_height
+        )
+
+
+class FakeCollector:
+    def __init__(self):
+        self.calls = []
+
+    def stop(self):
+        self.calls.append("stop")
+
+    def close(self):
+        self.calls.append("close")
+
+
+class FakeThread:
+    def __init__(self, alive):
+        self.alive = alive
+
+    def is_alive(self):
+        return self.alive
+
+
+@pytest.fixture
+def collect_widgets(monkeypatch):
+    monkeypatch.setattr(gui, "label_collect_status", FakeLabel())
+    monkeypatch.setattr(gui, "button_collect_start", FakeLabel())
+    monkeypatch.setattr(gui, "after_handles", [])
+
+
+def test_stop_collect_sequence_stops_or_closes_collector(
+    monkeypatch, collect_widgets
+    ):
+    running = FakeCollector()
+    monkeypatch.setattr(gui, "collector", running)
+    monkeypatch.setattr(gui, "collect_thread", FakeThread(alive=True))
+    gui.stop_collect_sequence()
+
+    idle = FakeCollector()
+    monkeypatch.setattr(gui, "collector", idle)
+    monkeypatch.setattr(gui, "collect_thread", FakeThread(alive=False))
+    gui.stop_collect_sequence()
+
+    assert running.calls == ["stop"]
+    assert idle.calls == ["close"]
+    assert gui.collector is None
+
+
+def test_stop_collect_sequence_after_record_thread_closed_collector(
+    monkeypatch, collect_widgets
+    ):
+    # the record thread finished and cleared the collector already
+    monkeypatch.setattr(gui, "collector", None)
+    monkeypatch.setattr(gui, "collect_thread", FakeThread(alive=True))
+
+    gui.stop_collect_sequence()
+
+    assert gui.label_collect_status.configured == [{"text": "Stopped."}]
@@ -0,0 +1,270 @@
+"""
+Tests for the non-blocking timed key actions and the event-driven updates
+of the input module.
+
+Replaces the key functions with a recorder and verifies that jumps, swim
+taps and throws return immediately, release their keys when due, and do
+not release keys the current pose holds, that pose changes only send the
+key-state delta, that state changes are applied with the
+rising/falling-edge semantics of the send permission, that the
+precompiled action table follows control scheme changes and reloads of
+the custom key mapping, and that pose changes record their
+capture-to-key latency.
+"""
+
+import json
+import time
+
+import pytest
+
+from super_mario_motion import input as smm_input
+from super_mario_motion import input_backends, latency
+from super_mario_motion.settings import Settings
+from super_mario_motion.state import StateManager
+
+# pressing keys must return without waiting for their release
+MAX_DISPATCH_S = 0.05
+# a pose captured 50 ms before dispatch, minus the histogram's bucket width
+MIN_CAPTURE_TO_KEY_MS = 45
+
+
+@pytest.fixture
+def events(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(
+        smm_input, "_key_down", lambda key: recorded.append(("down", key))
+        )
+    monkeypatch.setattr(
+        smm_input, "_key_up", lambda key: recorded.append(("up", key))
+        )
+    monkeypatch.setattr(smm_input, "currently_held_keys", [])
+    monkeypatch.setattr(smm_input, "pending_releases", [])
+    monkeypatch.setattr(smm_input, "release_due", {})
+    monkeypatch.setattr(smm_input, "last_orientation", "right")
+    monkeypatch.setattr(smm_input, "previous_send_permission", False)
+    monkeypatch.setattr(smm_input, "last_pose", "standing")
+    monkeypatch.setattr(
+        StateManager, "gui_control_scheme", "Original (RetroArch)"
+        )
+    monkeypatch.setattr(StateManager, "gui_current_mode", "Simple")
+    monkeypatch.setattr(StateManager, "gui_checkbox_send_permission", False)
+    monkeypatch.setattr(StateManager, "pose", "standing")
+    monkeypatch.setattr(smm_input, "action_table", {})
+    monkeypatch.setattr(smm_input, "action_table_version", -1)
+    smm_input.rebuild_action_table()
+    return recorded
+
+
+def test_jump_does_not_block(events):
+    t_start = time.monotonic()
+    smm_input.press_designated_input("jumping")
+
+    assert time.monotonic() - t_start < MAX_DISPATCH_S
+    assert events == [("down", "x"), ("down", "right")]
+
+
+def test_jump_keys_are_released_when_due(events):
+    smm_input.tap_keys(["x", "right"], Settings.jump_duration, now=10.0)
+
+    smm_input.process_due_releases(now=10.4)
+    assert ("up", "x") not in events
+
+    smm_input.process_due_releases(now=10.5)
+    assert events[-2:] == [("up", "x"), ("up", "right")]
+    assert smm_input.next_release_time() is None
+
+
+def test_held_keys_survive_timed_release(events):
+    smm_input.tap_keys(["x", "right"], 0.5, now=0.0)
+    # pose changes to walking_right while the jump is still pending
+    smm_input.press_designated_input("walking_right")
+
+    smm_input.process_due_releases(now=1.0)
+
+    assert ("up", "x") in events
+    assert ("up", "right") not in events
+
+
+def test_repeated_tap_reschedules_release(events):
+    smm_input.tap_keys(["x"], 0.5, now=0.0)
+    smm_input.tap_keys(["x"], 0.5, now=0.3)
+
+    smm_input.process_due_releases(now=0.6)
+    # the first tap was released by the second one, not by its own timer
+    assert events == [("down", "x"), ("up", "x"), ("down", "x")]
+    assert smm_input.next_release_time() == pytest.approx(0.8)
+
+    smm_input.process_due_releases(now=0.8)
+    assert events == [("down", "x"), ("up", "x"), ("down", "x"), ("up", "x")]
+
+
+def test_quick_second_jump_is_a_separate_press(monkeypatch):
+    backend = input_backends.RecordingBackend()
+    monkeypatch.setattr(smm_input, "backend", backend)
+    monkeypatch.setattr(smm_input, "currently_held_keys", [])
+    monkeypatch.setattr(smm_input, "pending_releases", [])
+    monkeypatch.setattr(smm_input, "release_due", {})
+    monkeypatch.setattr(smm_input, "last_orientation", "right")
+    monkeypatch.setattr(
+        StateManager, "gui_control_scheme", "Original (RetroArch)"
+        )
+    monkeypatch.setattr(smm_input, "action_table", {})
+    smm_input.rebuild_action_table()
+
+    smm_input.press_designated_input("jumping", now=0.0)
+    smm_input.press_designated_input("standing", now=0.1)
+    smm_input.press_designated_input("jumping", now=0.2)
+    smm_input.process_due_releases(now=0.2 + Settings.jump_duration)
+
+    assert [(e.action, e.key) for e in backend.events] == [
+        ("down", "x"), ("down", "right"),
+        ("up", "x"), ("down", "x"), ("up", "right"), ("down", "right"),
+        ("up", "x"), ("up", "right"),
+        ]
+    assert backend.pressed() == []
+    assert smm_input.next_release_time() is None
+
+
+def test_release_pending_keys(events):
+    smm_input.tap_keys(["x", "right"], 0.5, now=0.0)
+
+    smm_input.release_pending_keys()
+
+    assert events[-2:] == [("up", "x"), ("up", "right")]
+    assert smm_input.next_release_time() is None
+
+
+def test_update_inputs_follows_permission_edges(events):
+    StateManager.set_pose("walking_right")
+    smm_input.update_inputs(now=0.0)
+    assert events == []
+
+    StateManager.set_send_permission(True)
+    smm_input.update_inputs(now=0.1)
+    assert events == [("down", "right")]
+
+    StateManager.set_pose("crouching")
+    smm_input.update_inputs(now=0.2)
+    assert events[1:] == [("up", "right"), ("down", "down")]
+
+    StateManager.set_send_permission(False)
+    smm_input.update_inputs(now=0.3)
+    assert events[-1] == ("up", "down")
+    assert smm_input.currently_held_keys == []
+
+
+def test_next_wakeup_only_for_timed_work(events):
+    assert smm_input.next_wakeup(now=0.0) is None
+
+    StateManager.set_send_permission(True)
+    StateManager.set_pose("swimming")
+    smm_input.update_inputs(now=1.0)
+
+    # swim tap release is due first, then the next swim tap
+    assert smm_input.next_wakeup(now=1.0) == pytest.approx(
+        Settings.swim_tap_duration
+        )
+    smm_input.update_inputs(now=1.0 + Settings.swim_tap_duration)
+    assert smm_input.next_wakeup(
+        now=1.0 + Settings.swim_tap_duration
+        ) == pytest.approx(Settings.swim_interval - Settings.swim_tap_duration)
+
+
+def test_pose_change_sends_only_key_delta(events):
+    smm_input.press_designated_input("running_right")
+    assert events == [("down", "y"), ("down", "right")]
+
+    smm_input.press_designated_input("walking_right")
+    assert events[2:] == [("up", "y")]
+    assert smm_input.currently_held_keys == ["right"]
+
+    smm_input.press_designated_input("walking_left")
+    assert events[3:] == [("up", "right"), ("down", "left")]
+
+
+def test_jump_from_walking_releases_held_keys(events):
+    smm_input.press_designated_input("walking_left")
+    smm_input.press_designated_input("jumping", now=0.0)
+
+    assert events[1:] == [("up", "left"), ("down", "x"), ("down", "left")]
+    assert smm_input.currently_held_keys == []
+
+
+def test_compile_action_table():
+    table = smm_input.compile_action_table(
+        smm_input.CONTROL_SCHEMES["Supermarioplay (Web)"]
+        )
+
+    assert table["running_left"].held == ("shift", "left")
+    assert table["running_left"].orientation == "left"
+    assert table["jumping"].taps == ("up", smm_input.ORIENTATION)
+    assert table["throwing"].taps == ("shift",)
+    assert table["throwing"].tap_duration == Settings.throw_tap_duration
+
+
+def test_scheme_change_swaps_action_table(events, monkeypatch):
+    monkeypatch.setattr(StateManager, "key_mapping_version", 0)
+    StateManager.set_send_permission(True)
+    StateManager.set_pose("jumping")
+    smm_input.update_inputs(now=0.0)
+    assert events[0] == ("down", "x")
+
+    StateManager.set_control_scheme("Supermarioplay (Web)")
+    StateManager.set_pose("throwing")
+    smm_input.update_inputs(now=0.1)
+
+    assert events[-1] == ("down", "shift")
+
+
+def test_reloading_custom_keymap_swaps_action_table(
+        events, monkeypatch, tmp_path
+        ):
+    config = tmp_path / "config.json"
+    mapping = {
+        "jump": "space", "run_throw": "shift", "left": "a", "right": "d",
+        "down": "s"
+        }
+    config.write_text(json.dumps({"custom_key_mapping": mapping}))
+    monkeypatch.setattr(StateManager, "config_path", str(config))
+    monkeypatch.setattr(StateManager, "custom_key_mapping", {})
+    monkeypatch.setattr(StateManager, "gui_control_scheme", "Custom")
+    monkeypatch.setitem(smm_input.CONTROL_SCHEMES, "Custom", {})
+    smm_input.load_custom_keymap()
+    smm_input.update_inputs(now=0.0)
+    assert smm_input.action_table["jumping"].taps[0] == "space"
+
+    config.write_text(
+        json.dumps({"custom_key_mapping": {**mapping, "jump": "q"}})
+        )
+    smm_input.load_custom_keymap()
+    smm_input.update_inputs(now=0.1)
+
+    assert smm_input.action_table["jumping"].taps[0] == "q"
+
+
+def test_throw_releases_key_when_due(events):
+    (key,) = smm_input.action_table["throwing"].taps
+    due = 5.0 + Settings.throw_tap_duration
+    smm_input.press_designated_input("throwing", now=5.0)
+
+    # the key-up is scheduled, not sent right after the key-down
+    assert events == [("down", key)]
+    assert smm_input.next_release_time() == due
+
+    smm_input.process_due_releases(due)
+
+    assert events == [("down", key), ("up", key)]
+
+
+def test_pose_change_records_capture_to_key_latency(events, monkeypatch):
+    monkeypatch.setattr(latency, "histograms", {})
+    StateManager.set_send_permission(True)
+    smm_input.update_inputs(now=0.0)
+
+    StateManager.set_pose("crouching", 42, time.perf_counter() - 0.05)
+    smm_input.update_inputs(now=0.1)
+
+    stats = latency.summary()
+    assert stats["capture_to_key"]["count"] == 1
+    assert stats["capture_to_key"]["p50_ms"] >= MIN_CAPTURE_TO_KEY_MS
+    assert stats["input_dispatch"]["count"] == 1
@@ -0,0 +1,118 @@
+"""
+Tests for the key-output backends.
+
+Verifies the timestamped RecordingBackend (also end-to-end through the
+input module), the uinput backend against a fake evdev module, including
+keys without an evdev code, and the fallback to pyautogui.
+"""
+
+import sys
+import types
+
+import pytest
+
+from super_mario_motion import input as smm_input
+from super_mario_motion import input_backends
+from super_mario_motion.state import StateManager
+
+
+def test_recording_backend_timestamps_events():
+    backend = input_backends.RecordingBackend()
+    backend.key_down("x")
+    backend.key_down("right")
+    backend.key_up("x")
+
+    assert [(e.action, e.key) for e in backend.events] == [
+        ("down", "x"), ("down", "right"), ("up", "x")
+        ]
+    timestamps = [e.timestamp for e in backend.events]
+    assert timestamps == sorted(timestamps)
+    assert backend.pressed() == ["right"]
+
+
+def test_input_module_sends_to_backend(monkeypatch):
+    backend = input_backends.RecordingBackend()
+    monkeypatch.setattr(smm_input, "backend", backend)
+    monkeypatch.setattr(smm_input, "currently_held_keys", [])
+    monkeypatch.setattr(
+        StateManager, "gui_control_scheme", "Supermarioplay (Web)"
+        )
+    monkeypatch.setattr(smm_input, "action_table", {})
+    smm_input.rebuild_action_table()
+
+    smm_input.press_designated_input("running_left")
+
+    assert backend.pressed() == ["shift", "left"]
+
+
+class FakeUInput:
+    def __init__(self, name):
+        self.written = []
+
+    def write(self, ev_type, code, value):
+        self.written.append((ev_type, code, value))
+
+    def syn(self):
+        self.written.append("syn")
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_evdev(monkeypatch):
+    ecodes = types.SimpleNamespace(
+        EV_KEY=1, KEY_X=45, KEY_LEFT=105, KEY_LEFTSHIFT=42, KEY_KP0=82,
+        KEY_COMMA=51
+        )
+    module = types.ModuleType("evdev")
+    module.UInput = FakeUInput
+    module.ecodes = ecodes
+    monkeypatch.setitem(sys.modules, "evdev", module)
+
+
+def test_uinput_backend_writes_key_codes(fake_evdev):
+    backend = input_backends.create_backend("uinput")
+    backend.key_down("x")
+    backend.key_up("shift")
+    backend.key_down("left")
+
+    assert backend.name == "uinput"
+    assert backend._ui.written == [
+        (1, 45, 1), "syn", (1, 42, 0), "syn", (1, 105, 1), "syn"
+        ]
+
+
+def test_uinput_resolves_symbol_and_numpad_keys(fake_evdev):
+    backend = input_backends.create_backend("uinput")
+    backend.prepare(["num0", ","])
+
+    assert backend._codes == {"num0": 82, ",": 51}
+
+
+def test_uinput_sends_unknown_keys_with_fallback(fake_evdev, monkeypatch):
+    fallback = input_backends.RecordingBackend()
+    monkeypatch.setattr(input_backends, "PyAutoGuiBackend", lambda: fallback)
+    backend = input_backends.create_backend("uinput")
+
+    backend.prepare(["f13", "x"])
+    backend.key_down("f13")
+    backend.key_up("f13")
+
+    assert backend._ui.written == []
+    assert [(e.action, e.key) for e in fallback.events] == [
+        ("down", "f13"), ("up", "f13")
+        ]
+
+
+def test_key_backend_is_abstract():
+    with pytest.raises(TypeError):
+        input_backends.KeyBackend()
+
+
+def test_uinput_falls_back_to_pyautogui(monkeypatch):
+    monkeypatch.setitem(sys.modules, "evdev", None)
+
+    backend = input_backends.create_backend("uinput")
+
+    assert backend.name == "pyautogui"
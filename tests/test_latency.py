@@ -0,0 +1,64 @@
+"""
+Tests for the per-stage latency histograms.
+
+Verifies percentile accuracy of the log buckets, the ordering of the
+summary, untagged frames being ignored and the JSON dump.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from super_mario_motion import latency
+
+
+@pytest.fixture(autouse=True)
+def clean_histograms(monkeypatch):
+    monkeypatch.setattr(latency, "histograms", {})
+
+
+def test_percentiles_are_within_bucket_accuracy():
+    samples = np.random.default_rng(0).uniform(0.001, 0.1, 10000)
+    histogram = latency.LatencyHistogram()
+    for s in samples:
+        histogram.record(float(s))
+
+    for q in (50, 95, 99):
+        assert histogram.percentile(q) == pytest.approx(
+            np.percentile(samples, q), rel=0.07
+            )
+    assert histogram.stats()["max_ms"] == pytest.approx(samples.max() * 1e3)
+
+
+def test_empty_histogram_has_no_percentiles():
+    assert np.isnan(latency.LatencyHistogram().percentile(50))
+
+
+def test_summary_is_in_pipeline_order():
+    latency.record("capture_to_key", 0.05)
+    latency.record("custom_stage", 0.01)
+    latency.record("queue_wait", 0.002)
+
+    assert list(latency.summary()) == [
+        "queue_wait", "capture_to_key", "custom_stage"
+        ]
+    assert "capture_to_key" in latency.format_summary()
+
+
+def test_record_since_ignores_untagged_frames():
+    latency.record_since("capture_to_key", 0.0, 12.0)
+    latency.record_since("capture_to_key", 11.5, 12.0)
+
+    stats = latency.summary()["capture_to_key"]
+    assert stats["count"] == 1
+    assert stats["p50_ms"] == pytest.approx(500, rel=0.07)
+
+
+def test_dump_json(tmp_path):
+    latency.record("pose_inference", 0.02)
+
+    latency.dump_json(tmp_path / "latency.json")
+
+    data = json.loads((tmp_path / "latency.json").read_text())
+    assert data["pose_inference"]["count"] == 1
@@ -0,0 +1,89 @@
+"""
+Tests for the compiled NumPy evaluation of the linear SVM pose model.
+
+Trains small StandardScaler -> SVC pipelines on synthetic data and checks
+that the compiled model reproduces sklearn's probabilities, also after a
+save/load round trip, and that the bundled model compiles.
+"""
+
+import glob
+import os
+
+import numpy as np
+import pytest
+from joblib import load
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from super_mario_motion import path_helper as ph
+from super_mario_motion.linear_svm import CompiledLinearSVM, compile_model
+from super_mario_motion.pose_features import extract_features
+
+# libsvm stops its iterative pairwise coupling early, the compiled model
+# solves the coupling problem exactly
+PROBA_TOL = 5e-3
+
+
+def train_pipeline(n_classes, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(scale=3.0, size=(n_classes, 6))
+    y = np.repeat(np.arange(n_classes), 40)
+    x = centers[y] + rng.normal(scale=2.0, size=(len(y), 6)) + 10.0
+    labels = np.array([f"pose_{i}" for i in range(n_classes)])[y]
+    pipe = Pipeline(
+        [
+            ("scaler", StandardScaler()),
+            ("clf", SVC(kernel="linear", probability=True, random_state=0))
+            ]
+        )
+    return pipe.fit(x, labels), x.astype(np.float32)
+
+
+@pytest.mark.parametrize("n_classes", [2, 3, 5])
+def test_compiled_matches_sklearn(n_classes):
+    pipe, x = train_pipeline(n_classes)
+    compiled = CompiledLinearSVM.from_pipeline(pipe)
+
+    expected = pipe.predict_proba(x)
+    actual = compiled.predict_proba(x)
+
+    assert list(compiled.classes_) == list(pipe.classes_)
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, atol=PROBA_TOL)
+    np.testing.assert_allclose(actual.sum(axis=1), 1.0, atol=1e-6)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    pipe, x = train_pipeline(4)
+    compiled = CompiledLinearSVM.from_pipeline(pipe)
+    path = tmp_path / "pose_model.npz"
+
+    compiled.save(path)
+    loaded = CompiledLinearSVM.load(path)
+
+    assert loaded.coef.dtype == np.float32
+    assert list(loaded.classes_) == list(compiled.classes_)
+    np.testing.assert_array_equal(
+        loaded.predict_proba(x), compiled.predict_proba(x)
+        )
+
+
+def test_compile_model_keeps_unsupported_models():
+    pipe, _ = train_pipeline(3)
+    pipe.set_params(clf__kernel="rbf")
+
+    assert compile_model(pipe) is pipe
+
+
+def test_bundled_model_compiles():
+    model = load(ph.resource_path(os.path.join("data", "pose_model.joblib")))
+    compiled = compile_model(model)
+    npy_dir = os.path.join(os.path.dirname(__file__), "npy")
+    files = glob.glob(os.path.join(npy_dir, "**", "*.npy"), recursive=True)
+    x = np.array([extract_features(np.load(f)) for f in files])
+
+    assert isinstance(compiled, CompiledLinearSVM)
+    np.testing.assert_allclose(
+        compiled.predict_proba(x), model.predict_proba(x), atol=PROBA_TOL
+        )
@@ -0,0 +1,119 @@
+"""
+Tests for the GUI refresh scheduling of the main module.
+
+Replaces the Tk window and variables with fakes and verifies that every
+source version is reported once, that the update tick backs off from
+`Settings.gui_update_ms` to `Settings.gui_idle_update_ms` while nothing
+changes, and that writing a traced GUI variable requests an immediate
+update and resets the tick.
+"""
+
+import pytest
+
+from super_mario_motion import gui, main, vision
+from super_mario_motion.settings import Settings
+from super_mario_motion.state import StateManager
+
+# the tick doubles from 20 ms while idle and is capped at 200 ms
+IDLE_DELAYS_MS = [20, 40, 80, 160, 200, 200]
+
+
+class FakeWindow:
+    def __init__(self):
+        self.delays = []
+        self.cancelled = []
+
+    def after(self, delay_ms, callback):
+        self.delays.append(delay_ms)
+        return len(self.delays)
+
+    def after_cancel(self, after_id):
+        self.cancelled.append(after_id)
+
+
+class FakeVar:
+    def __init__(self, value):
+        self.value = value
+        self.traces = []
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        for callback in self.traces:
+            callback()
+
+    def trace_add(self, mode, callback):
+        self.traces.append(callback)
+
+
+@pytest.fixture
+def window(monkeypatch):
+    window = FakeWindow()
+    monkeypatch.setattr(gui, "window", window)
+    monkeypatch.setattr(Settings, "gui_update_ms", 20)
+    monkeypatch.setattr(Settings, "gui_idle_update_ms", 200)
+    monkeypatch.setattr(main, "state_manager", StateManager, raising=False)
+    monkeypatch.setattr(main, "shown_versions", {})
+    monkeypatch.setattr(main, "idle_delay_ms", Settings.gui_update_ms)
+    monkeypatch.setattr(main, "update_after_id", None)
+    monkeypatch.setattr(StateManager, "gui_current_mode", "Simple")
+    monkeypatch.setattr(
+        StateManager, "gui_control_scheme", "Original (RetroArch)"
+        )
+    monkeypatch.setattr(StateManager, "gui_checkbox_send_permission", False)
+    monkeypatch.setattr(gui, "selected_mode", FakeVar("Simple"))
+    monkeypatch.setattr(
+        gui, "selected_control_scheme", FakeVar("Original (RetroArch)")
+        )
+    monkeypatch.setattr(gui, "send_keystrokes", FakeVar(False))
+    monkeypatch.setattr(gui, "selected_preview", FakeVar("Webcam"))
+    monkeypatch.setattr(gui, "allow_debug_info", FakeVar(False))
+    monkeypatch.setattr(vision, "update_images", lambda *_: None)
+    for name in [
+        "set_webcam_image", "update_pose", "update_pose_image",
+        "update_pose_text", "set_gamepad_buttons", "update_debug_landmarks",
+        "update_debug_latency"
+        ]:
+        monkeypatch.setattr(gui, name, lambda *_: None)
+    return window
+
+
+def test_source_changed_reports_each_version_once(monkeypatch):
+    monkeypatch.setattr(main, "shown_versions", {})
+
+    assert main.source_changed("input", 3)
+    assert not main.source_changed("input", 3)
+    assert main.source_changed("input", 4)
+    assert main.source_changed("debug", 4)
+
+
+def test_update_tick_backs_off_while_idle(window):
+    for _ in IDLE_DELAYS_MS:
+        main.update()
+
+    # the first update shows every source, the later ones find no change
+    assert window.delays == IDLE_DELAYS_MS
+    assert window.cancelled == []
+
+
+def test_traced_variable_write_resets_the_tick(window):
+    main.bind_gui_state()
+    main.update()
+    main.update()
+    main.update()
+    assert main.idle_delay_ms == IDLE_DELAYS_MS[2]
+    pending = main.update_after_id
+    window.delays.clear()
+
+    gui.selected_control_scheme.set("Supermarioplay (Web)")
+
+    # the pending tick is replaced by an immediate update
+    assert StateManager.get_control_scheme() == "Supermarioplay (Web)"
+    assert window.cancelled[-1] == pending
+    assert window.delays == [0]
+
+    main.update()
+
+    assert window.delays == [0, IDLE_DELAYS_MS[0]]
@@ -1,7 +1,10 @@
 import numpy as np
 import pytest
 
-from super_mario_motion.pose_features import _angle, _mid, extract_features
+from super_mario_motion.pose_features import (
+    FeatureExtractor, _angle, _mid,
+    extract_features, extract_features_batch
+    )
 
 N_LM = 33
 
@@ -45,3 +48,45 @@ def test_extract_features():
     assert feats.ndim == 1
     assert feats.dtype == np.float32
     assert len(feats) > 2 * N_LM
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_extract_features_batch_matches_single_frame(dtype):
+    rng = np.random.default_rng(0)
+    lm = rng.random((50, N_LM, 4)).astype(dtype)
+    # degenerate joint: elbow on top of the wrist
+    lm[0, 13] = lm[0, 15]
+
+    batch = extract_features_batch(lm)
+    single = np.stack([extract_features(frame) for frame in lm])
+
+    assert batch.dtype == single.dtype
+    np.testing.assert_array_equal(batch, single)
+
+
+def test_extract_features_batch_empty_pose():
+    lm = np.stack([make_empty_pose(), make_empty_pose()])
+
+    np.testing.assert_array_equal(
+        extract_features_batch(lm)[0], extract_features(lm[0])
+        )
+
+
+def test_feature_extractor_matches_extract_features():
+    rng = np.random.default_rng(1)
+    lm = rng.random((20, N_LM, 4)).astype(np.float32)
+    lm[0, 13] = lm[0, 15]
+    extractor = FeatureExtractor()
+
+    for frame in list(lm) + [make_empty_pose()]:
+        feats = extractor.extract(frame)
+        assert feats is extractor.out
+        np.testing.assert_array_equal(feats, extract_features(frame))
+
+
+def test_feature_extractor_fills_given_buffer():
+    lm = np.random.rand(N_LM, 4).astype(np.float32)
+    out = np.zeros_like(FeatureExtractor().out)
+
+    assert FeatureExtractor().extract(lm, out=out) is out
+    np.testing.assert_array_equal(out, extract_features(lm))
@@ -0,0 +1,217 @@
+"""
+Tests for the binary pose sample store.
+
+Verifies buffered appends, shard flushing, reopening via the manifest,
+memory-mapped loading, per-shard feature widths, stored raw landmarks
+with re-featurization and the discovery and conversion of legacy CSV
+files.
+"""
+
+import numpy as np
+import pytest
+
+from super_mario_motion.pose_features import (
+    extract_features,
+    extract_features_batch
+    )
+from super_mario_motion.sample_store import (
+    SampleStore,
+    convert_csv,
+    legacy_csvs,
+    read_csv
+    )
+
+N_FEATURES = len(extract_features(np.zeros((33, 4), dtype=np.float32)))
+
+
+def make_features(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.random((n, N_FEATURES)).astype(np.float32)
+
+
+def test_append_is_buffered_until_flush(tmp_path):
+    store = SampleStore(tmp_path / "samples")
+    store.append("standing", make_features(1)[0])
+
+    assert store.pending == 1
+    assert len(store) == 0
+    assert not (tmp_path / "samples").exists()
+
+    store.flush()
+
+    assert store.pending == 0
+    assert len(store) == 1
+
+
+def test_round_trip_over_multiple_shards(tmp_path):
+    first, second = make_features(3, 1), make_features(2, 2)
+    with SampleStore(tmp_path, run_name="a") as store:
+        store.append_many(["jumping"] * 3, first)
+        store.flush()
+        store.append_many(["standing", "jumping"], second)
+
+    x, y = SampleStore(tmp_path).load()
+
+    np.testing.assert_array_equal(x, np.concatenate([first, second]))
+    assert list(y) == ["jumping"] * 3 + ["standing", "jumping"]
+    assert SampleStore(tmp_path).labels == ["jumping", "standing"]
+
+
+def test_single_shard_is_memory_mapped(tmp_path):
+    with SampleStore(tmp_path) as store:
+        store.append_many(["crouching"] * 4, make_features(4))
+
+    x, _ = SampleStore(tmp_path).load()
+
+    assert isinstance(x, np.memmap)
+    assert x.dtype == np.float32
+
+
+def test_new_instances_append_new_shards(tmp_path):
+    n_runs = 2
+    for i in range(n_runs):
+        with SampleStore(tmp_path, run_name="run") as store:
+            store.append("throwing", make_features(1, i)[0])
+
+    assert len(SampleStore(tmp_path)) == n_runs
+
+
+def test_flush_rejects_mixed_feature_lengths(tmp_path):
+    store = SampleStore(tmp_path)
+    store.append("standing", np.zeros(3, dtype=np.float32))
+    store.append("standing", np.zeros(4, dtype=np.float32))
+
+    with pytest.raises(ValueError):
+        store.flush()
+
+
+def test_feature_width_is_recorded_per_shard(tmp_path):
+    new_width = N_FEATURES + 2
+    with SampleStore(tmp_path, run_name="old") as store:
+        store.append("standing", make_features(1)[0])
+    # a changed extract_features must not break collecting
+    with SampleStore(tmp_path, run_name="new") as store:
+        store.append("standing", np.zeros(new_width, dtype=np.float32))
+
+    shards = SampleStore(tmp_path)._manifest["shards"]
+
+    assert [shard["n_features"] for shard in shards] == [
+        N_FEATURES, new_width
+        ]
+
+
+def make_landmarks(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.random((n, 33, 4)).astype(np.float32)
+
+
+def test_landmarks_and_timestamps_round_trip(tmp_path):
+    landmarks = make_landmarks(3)
+    with SampleStore(tmp_path) as store:
+        for i, lm in enumerate(landmarks):
+            store.append("walking", extract_features(lm), lm, 100.0 + i)
+        # shard without landmarks, e.g. converted from a CSV
+        store.flush()
+        store.append_many(["standing"], make_features(1))
+
+    lm, ts, y = SampleStore(tmp_path).load_landmarks()
+
+    np.testing.assert_array_equal(lm, landmarks)
+    np.testing.assert_array_equal(ts, [100.0, 101.0, 102.0])
+    assert list(y) == ["walking"] * 3
+
+
+def test_load_recomputes_features_from_landmarks(tmp_path):
+    landmarks = make_landmarks(4, 3)
+    legacy = make_features(2, 4)
+    with SampleStore(tmp_path) as store:
+        for lm in landmarks:
+            # stale features, as if written by an older extract_features
+            store.append("crouching", np.zeros(N_FEATURES), lm)
+        store.flush()
+        store.append_many(["standing"] * 2, legacy)
+
+    x, y = SampleStore(tmp_path).load(featurize=extract_features_batch)
+
+    expected = np.stack([extract_features(lm) for lm in landmarks])
+    np.testing.assert_array_equal(x[:4], expected)
+    np.testing.assert_array_equal(x[4:], legacy)
+    assert list(y) == ["crouching"] * 4 + ["standing"] * 2
+
+
+def test_load_skips_stale_shards_without_landmarks(tmp_path, capsys):
+    landmarks = make_landmarks(2, 5)
+    with SampleStore(tmp_path, run_name="csv") as store:
+        # converted from a CSV of an older, narrower extract_features
+        store.append_many(["standing"] * 3, np.zeros((3, 4)))
+    with SampleStore(tmp_path, run_name="rec") as store:
+        for lm in landmarks:
+            store.append("jumping", np.zeros(4), lm)
+
+    x, y = SampleStore(tmp_path).load(featurize=extract_features_batch)
+
+    assert x.shape == (len(landmarks), N_FEATURES)
+    assert list(y) == ["jumping"] * len(landmarks)
+    assert "csv_000" in capsys.readouterr().out
+
+
+def test_load_names_shards_with_different_widths(tmp_path):
+    with SampleStore(tmp_path, run_name="old") as store:
+        store.append("standing", np.zeros(4))
+    with SampleStore(tmp_path, run_name="new") as store:
+        store.append("standing", make_features(1)[0])
+
+    with pytest.raises(ValueError, match="old_000 .* new_000"):
+        SampleStore(tmp_path).load()
+
+
+def test_flush_rejects_partial_landmarks(tmp_path):
+    store = SampleStore(tmp_path)
+    store.append("standing", make_features(1)[0], make_landmarks(1)[0])
+    store.append("standing", make_features(1)[0])
+
+    with pytest.raises(ValueError):
+        store.flush()
+
+
+def test_convert_csv(tmp_path):
+    features = make_features(2)
+    csv_path = tmp_path / "pose_samples_test.csv"
+    labels = ["walking_left", "swimming"]
+    lines = ["label," + ",".join(f"f{i}" for i in range(N_FEATURES))]
+    for label, row in zip(labels, features, strict=True):
+        lines.append(label + "," + ",".join(f"{v:.6f}" for v in row))
+    csv_path.write_text("\n".join(lines) + "\n")
+
+    store = SampleStore(tmp_path / "samples", run_name=csv_path.stem)
+    assert convert_csv(csv_path, store) == len(labels)
+
+    x, y = SampleStore(tmp_path / "samples").load()
+    assert list(y) == labels
+    np.testing.assert_allclose(x, features, atol=1e-6)
+
+
+def test_legacy_csvs_leaves_out_converted_files(tmp_path):
+    for name in ["pose_samples_a", "pose_samples_b", "pose_samples_all"]:
+        (tmp_path / f"{name}.csv").write_text("label,f0\njumping,1\n")
+    store = SampleStore(tmp_path / "samples", run_name="pose_samples_a")
+    convert_csv(tmp_path / "pose_samples_a.csv", store)
+
+    assert [p.name for p in legacy_csvs(tmp_path)] == [
+        "pose_samples_a.csv", "pose_samples_b.csv"
+        ]
+    assert [p.name for p in legacy_csvs(tmp_path, store)] == [
+        "pose_samples_b.csv"
+        ]
+
+
+def test_read_csv_takes_width_from_file(tmp_path):
+    csv_path = tmp_path / "pose_samples_short.csv"
+    csv_path.write_text(
+        "label,f0,f1,f2\njumping,1,2,3\nbroken,1,2\nstanding,4,5,6\n"
+        )
+
+    labels, features = read_csv(csv_path)
+
+    assert labels == ["jumping", "standing"]
+    np.testing.assert_array_equal(features, [[1, 2, 3], [4, 5, 6]])
@@ -0,0 +1,80 @@
+"""
+Tests for the versioned pose snapshots in StateManager.
+
+Verifies that publishing bumps the version, keeps the plain getters in
+sync and that waiting consumers wake up on new snapshots or time out.
+"""
+
+import threading
+
+import numpy as np
+
+from super_mario_motion.state import StateManager
+
+
+def test_publish_snapshot_bumps_version_and_updates_getters():
+    lm = np.zeros((33, 4), dtype=np.float32)
+    before = StateManager.get_snapshot().version
+
+    snapshot = StateManager.publish_snapshot(lm, "jumping", 7, 1.5)
+
+    assert snapshot.version == before + 1
+    assert (snapshot.frame_id, snapshot.timestamp) == (7, 1.5)
+    assert StateManager.get_snapshot() is snapshot
+    assert StateManager.get_pose_landmarks() is lm
+    assert StateManager.get_pose() == "jumping"
+
+
+def test_wait_for_snapshot_times_out_without_new_data():
+    version = StateManager.get_snapshot().version
+
+    assert StateManager.wait_for_snapshot(version, timeout=0.01) is None
+
+
+def test_wait_for_snapshot_returns_newer_snapshot():
+    version = StateManager.get_snapshot().version
+    publisher = threading.Timer(
+        0.01, StateManager.publish_snapshot, args=(None, "standing")
+        )
+    publisher.start()
+
+    snapshot = StateManager.wait_for_snapshot(version, timeout=2.0)
+    publisher.join()
+
+    assert snapshot is not None
+    assert snapshot.version == version + 1
+
+
+def test_input_version_only_changes_on_actual_change():
+    StateManager.set_send_permission(False)
+    version = StateManager.get_input_version()
+
+    StateManager.set_send_permission(False)
+    assert StateManager.get_input_version() == version
+
+    StateManager.set_send_permission(True)
+    StateManager.set_send_permission(False)
+    assert StateManager.get_input_version() == version + 2
+
+
+def test_wait_for_input_change_wakes_on_pose_change():
+    StateManager.set_pose_full_body("standing")
+    version = StateManager.get_input_version()
+    assert StateManager.wait_for_input_change(version, 0.01) == version
+
+    threading.Timer(
+        0.01, StateManager.set_pose_full_body, args=("jumping",)
+        ).start()
+    assert StateManager.wait_for_input_change(version, 2.0) == version + 1
+
+
+def test_pose_origin_is_tagged_by_changing_frame():
+    StateManager.publish_snapshot(None, "standing", 10, 2.0)
+    StateManager.set_pose_full_body("standing")
+    StateManager.publish_snapshot(None, "walking_left", 11, 3.0)
+    StateManager.publish_snapshot(None, "walking_left", 12, 4.0)
+
+    assert StateManager.get_pose_origin() == (11, 3.0)
+
+    StateManager.set_pose_full_body("swimming", 12, 4.0)
+    assert StateManager.get_pose_origin(full_body=True) == (12, 4.0)
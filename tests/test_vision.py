@@ -4,15 +4,30 @@ Unit tests for rule-based pose detection.
 Constructs synthetic landmark configurations to verify that
 `detect_pose_simple` returns the correct pose labels for standing,
 walking, running, jumping, crouching, throwing, and swimming cases.
+Also covers the single-slot frame buffer between grabber and inference,
+the on-demand landmark debug string, preview rendering, camera setup and
+the ROI crop for inference, down to cam_loop with a fake MediaPipe model.
 """
 
+import types
+
 import numpy as np
 
+from super_mario_motion import vision
+from super_mario_motion.settings import Settings
+from super_mario_motion.state import StateManager
 from super_mario_motion.vision import (
-    detect_pose_simple, eye_left,
-    eye_right, shoulder_left, shoulder_right, wrist_left, wrist_right
+    LatestFrame, detect_pose_simple, eye_left, eye_right,
+    format_landmark_string, landmark_coords, shoulder_left, shoulder_right,
+    wrist_left, wrist_right
     )
 
+# 33 landmarks, four per line
+N_LANDMARK_LINES = 9
+GRAY = 50
+FRAME_ID = 2201
+FILL = 9
+
 
 class DummyLm:
     def __init__(self, x, y):
@@ -148,3 +163,280 @@ def test_swimming():
 
     label = detect_pose_simple(frame, lm)
     assert label == "swimming"
+
+
+def test_latest_frame_keeps_newest_and_counts_drops():
+    buffer = LatestFrame()
+    first, second = make_frame(), make_frame()
+
+    buffer.put(first, 1.0)
+    buffer.put(second, 2.0)
+
+    frame_id, timestamp, frame = buffer.get(timeout=0)
+    assert frame is second
+    assert (frame_id, timestamp) == (2, 2.0)
+    assert buffer.dropped == 1
+
+
+def test_latest_frame_get_times_out_when_empty():
+    buffer = LatestFrame()
+    buffer.put(make_frame(), 1.0)
+    buffer.get(timeout=0)
+
+    assert buffer.get(timeout=0.01) is None
+
+
+def test_format_landmark_string_matches_landmark_coords():
+    lm = make_landmarks()
+    lm[wrist_left].x, lm[wrist_left].y = 0.123, 0.987
+    frame = make_frame()
+    landmarks = np.array(
+        [[p.x, p.y, p.z, p.visibility] for p in lm], dtype=np.float32
+        )
+
+    text = format_landmark_string(landmarks, 640, 480)
+
+    lines = text.split("\n")
+    assert len(lines) == N_LANDMARK_LINES
+    assert lines[0] == "0(320, 240) 1(320, 240) 2(320, 240) 3(320, 240) "
+    assert f"{wrist_left}{landmark_coords(frame, lm[wrist_left])}" in text
+
+
+def test_landmark_string_is_built_once_per_snapshot(monkeypatch):
+    calls = []
+
+    def fake_format(landmarks, width, height):
+        calls.append((width, height))
+        return "formatted"
+
+    monkeypatch.setattr(vision, "format_landmark_string", fake_format)
+    monkeypatch.setattr(vision, "latest_result", (1, make_frame(), None))
+    StateManager.publish_snapshot(np.zeros((33, 4)), "standing", 2101, 1.0)
+
+    assert vision.landmark_string() == "formatted"
+    assert vision.landmark_string() == "formatted"
+    assert calls == [(640, 480)]
+
+
+def test_draw_skeleton_skips_invisible_landmarks():
+    landmarks = np.zeros((33, 4), dtype=np.float32)
+    landmarks[:, :2] = 0.5
+    landmarks[shoulder_left] = [0.25, 0.25, 0.0, 1.0]
+    landmarks[shoulder_right] = [0.75, 0.25, 0.0, 1.0]
+    canvas = make_frame()
+
+    vision.draw_skeleton(canvas, landmarks)
+
+    # only the visible shoulders and the bone between them are drawn
+    assert tuple(canvas[120, 160]) == vision.JOINT_COLOR
+    assert tuple(canvas[120, 320]) == vision.CONNECTION_COLOR
+    assert not canvas[240, 320].any()
+
+
+def test_update_images_renders_only_the_selected_mode(monkeypatch):
+    rgb = np.full((480, 640, 3), GRAY, dtype=np.uint8)
+    landmarks = np.zeros((33, 4), dtype=np.float32)
+    landmarks[:, :2] = 0.5
+    landmarks[:, 3] = 1.0
+    monkeypatch.setattr(vision, "latest_result", (FRAME_ID, rgb, landmarks))
+    monkeypatch.setattr(vision, "skeleton_canvas", None)
+    monkeypatch.setattr(vision, "rendered_preview", None)
+
+    vision.update_images("Webcam")
+    webcam, skeleton, skeleton_only = StateManager.get_all_opencv_images()
+    assert webcam is rgb and skeleton is None and skeleton_only is None
+
+    vision.update_images("Skeleton Only")
+    _, skeleton, skeleton_only = StateManager.get_all_opencv_images()
+    assert skeleton is None
+    assert skeleton_only is vision.skeleton_canvas
+    assert not skeleton_only[0, 0].any()
+    assert skeleton_only[240, 320].any()
+
+    vision.update_images("Webcam + Skeleton")
+    _, skeleton, _ = StateManager.get_all_opencv_images()
+    assert skeleton is vision.skeleton_canvas
+    assert tuple(skeleton[0, 0]) == (GRAY, GRAY, GRAY)
+    assert np.all(rgb == GRAY)
+    assert StateManager.get_opencv_image_frame_id() == FRAME_ID
+
+
+def test_to_canonical_converts_once_in_place():
+    bgr = np.zeros((720, 1280, 3), dtype=np.uint8)
+    bgr[..., 0] = 255  # blue
+
+    rgb = vision.to_canonical(bgr)
+
+    assert rgb is bgr
+    assert tuple(rgb[0, 0]) == (0, 0, 255)
+
+
+def test_inference_frame_only_downscales_wider_frames():
+    wide = np.full((720, 1280, 3), FILL, dtype=np.uint8)
+    narrow = np.zeros((240, 320, 3), dtype=np.uint8)
+
+    small = vision.inference_frame(wide, 640)
+
+    assert small.shape == (360, 640, 3)
+    assert np.all(small == FILL)
+    assert vision.inference_frame(narrow, 640) is narrow
+
+
+def make_landmark_array(visibility=1.0):
+    landmarks = np.zeros((33, 4), dtype=np.float32)
+    landmarks[:, 3] = visibility
+    return landmarks
+
+
+def test_landmark_roi_adds_margin_and_clips_to_frame():
+    landmarks = make_landmark_array(0.0)
+    landmarks[shoulder_left] = [0.25, 0.5, 0.0, 1.0]
+    landmarks[wrist_right] = [0.5, 0.75, 0.0, 1.0]
+    landmarks[eye_left] = [0.95, 0.05, 0.0, 0.1]  # invisible
+
+    region = vision.landmark_roi(landmarks, 640, 480, margin=0.25)
+
+    # box 160x120 px, padded by 40 px on every side
+    assert region == (120, 200, 360, 400)
+    assert vision.landmark_roi(landmarks, 640, 480, margin=2.0) == (
+        0, 0, 640, 480
+        )
+    assert vision.landmark_roi(make_landmark_array(0.0), 640, 480) is None
+
+
+def test_region_to_frame_maps_crop_landmarks_back():
+    landmarks = make_landmark_array()
+    landmarks[0] = [0.0, 0.0, 0.5, 1.0]
+    landmarks[1] = [1.0, 0.5, 0.0, 1.0]
+
+    mapped = vision.region_to_frame(landmarks, (320, 240, 640, 480), 640, 480)
+
+    assert np.allclose(mapped[0], [0.5, 0.5, 0.25, 1.0])
+    assert np.allclose(mapped[1], [1.0, 0.75, 0.0, 1.0])
+    assert landmarks[0, 0] == 0.0
+
+
+def test_inference_region_redetects_full_frame_periodically(monkeypatch):
+    monkeypatch.setattr(Settings, "inference_roi", True)
+    monkeypatch.setattr(Settings, "roi_redetect_frames", 2)
+    monkeypatch.setattr(vision, "roi", None)
+    monkeypatch.setattr(vision, "roi_frames", 0)
+    landmarks = make_landmark_array()
+    landmarks[:, :2] = [0.5, 0.5]
+    landmarks[0, :2] = [0.25, 0.25]
+    full = (0, 0, 640, 480)
+
+    assert vision.inference_region(640, 480) == full
+    vision.update_roi(landmarks, 640, 480)
+    crop = vision.roi
+
+    assert crop is not None and crop != full
+    assert vision.inference_region(640, 480) == crop
+    assert vision.inference_region(640, 480) == crop
+    assert vision.inference_region(640, 480) == full
+
+    vision.update_roi(None, 640, 480)
+    assert vision.inference_region(640, 480) == full
+
+    monkeypatch.setattr(Settings, "inference_roi", False)
+    vision.update_roi(landmarks, 640, 480)
+    assert vision.roi is None
+
+
+class FakeCamera:
+    def __init__(self):
+        self.properties = {}
+
+    def set(self, prop, value):
+        self.properties[prop] = value
+
+
+def test_configure_camera_requests_width_and_height_together():
+    camera = FakeCamera()
+
+    vision.configure_camera(camera)
+
+    width = camera.properties[vision.cv.CAP_PROP_FRAME_WIDTH]
+    height = camera.properties[vision.cv.CAP_PROP_FRAME_HEIGHT]
+    assert width == Settings.webcam_res
+    assert width / height == vision.CAPTURE_ASPECT
+    assert camera.properties[vision.cv.CAP_PROP_FPS] == Settings.webcam_fps
+    assert camera.properties[vision.cv.CAP_PROP_BUFFERSIZE] == 1
+
+
+class FakeResults:
+    def __init__(self, landmarks):
+        self.pose_landmarks = types.SimpleNamespace(
+            landmark=[vision.Landmark(*p) for p in landmarks.tolist()]
+            )
+
+
+class FakePose:
+    """MediaPipe Pose stand-in returning scripted landmarks."""
+
+    def __init__(self, name, script, models, **options):
+        self.name = name
+        self.options = options
+        self.script = script
+        self.models = models
+        models.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def process(self, image):
+        landmarks, next_frame = self.script.pop(0)
+        self.script.calls.append((self.name, image.shape))
+        if next_frame is None:
+            vision._exit = True
+        else:
+            vision.latest_frame.put(next_frame, 0.0)
+        return FakeResults(landmarks)
+
+
+class Script(list):
+    def __init__(self, steps):
+        super().__init__(steps)
+        self.calls = []
+
+
+def test_cam_loop_runs_crops_on_own_model_and_maps_back(monkeypatch):
+    frame_w, frame_h = 640, 480
+    # full frame: player spans x 0.25..0.5, y 0.25..0.75
+    full = make_landmark_array()
+    full[:, :2] = [0.375, 0.5]
+    full[0, :2] = [0.25, 0.25]
+    full[1, :2] = [0.5, 0.75]
+    # crop: every landmark in the center of the crop
+    crop = make_landmark_array()
+    crop[:, :2] = [0.5, 0.5]
+    script = Script([(full, make_frame()), (crop, None)])
+    models = []
+    monkeypatch.setattr(Settings, "inference_roi", True)
+    monkeypatch.setattr(Settings, "roi_margin", 0.25)
+    monkeypatch.setattr(vision, "roi", None)
+    monkeypatch.setattr(vision, "roi_frames", 0)
+    monkeypatch.setattr(vision, "_exit", False)
+    monkeypatch.setattr(vision, "latest_frame", LatestFrame())
+    monkeypatch.setattr(
+        vision.mp_pose, "Pose",
+        lambda **options: FakePose(
+            "crop" if models else "full", script, models, **options
+            )
+        )
+    vision.latest_frame.put(make_frame(), 0.0)
+
+    vision.cam_loop()
+
+    # box 160x240 px padded by 60 px: region (100, 60, 380, 420)
+    assert script.calls == [
+        ("full", (frame_h, frame_w, 3)), ("crop", (360, 280, 3))
+        ]
+    assert models[0].options == {"static_image_mode": True}
+    assert models[1].options == {"smooth_landmarks": False}
+    published = StateManager.get_snapshot().landmarks
+    center = [(100 + 140) / frame_w, (60 + 180) / frame_h]
+    np.testing.assert_allclose(published[:, :2], [center] * 33)
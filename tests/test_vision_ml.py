@@ -0,0 +1,71 @@
+"""
+Tests for the event-driven full-body classification worker.
+
+Runs the worker against a stub model and verifies that every published
+snapshot is classified exactly once, snapshots from before the worker
+started are ignored and low-visibility frames are counted as skipped.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from super_mario_motion import vision_ml
+from super_mario_motion.state import StateManager
+
+
+class StubModel:
+    classes_ = np.array(["jumping", "standing"])
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, x):
+        self.calls += 1
+        return np.array([[0.9, 0.1]])
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_worker_classifies_each_snapshot_once(monkeypatch):
+    model = StubModel()
+    monkeypatch.setattr(vision_ml, "_model", model)
+    monkeypatch.setattr(vision_ml, "_exit", False)
+    for key in vision_ml.stats:
+        monkeypatch.setitem(vision_ml.stats, key, 0)
+
+    visible = np.ones((33, 4), dtype=np.float32)
+    hidden = np.zeros((33, 4), dtype=np.float32)
+    # published before the worker starts, e.g. before a restart
+    StateManager.publish_snapshot(visible, "standing")
+
+    worker = threading.Thread(target=vision_ml._worker, daemon=True)
+    worker.start()
+    try:
+        # the worker has finished its first wait for a snapshot
+        assert wait_until(lambda: vision_ml.get_stats()["idle_time"] > 0)
+        assert model.calls == 0
+
+        StateManager.publish_snapshot(hidden, "standing")
+        assert wait_until(
+            lambda: vision_ml.get_stats()[
+                "frames_skipped_low_visibility"] == 1
+            )
+        StateManager.publish_snapshot(visible, "standing")
+        assert wait_until(lambda: model.calls == 1)
+
+        # no new snapshot -> no further classification
+        time.sleep(0.05)
+        assert model.calls == 1
+        assert vision_ml.get_stats()["frames_classified"] == 1
+    finally:
+        vision_ml._exit = True
+        worker.join(timeout=1.0)